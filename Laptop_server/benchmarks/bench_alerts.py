@@ -0,0 +1,129 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""
+Frame round-trip with a slow audio unit: inline alert wait vs AlertDispatcher
+
+Posts frames to /frame/raw in-process (httpx ASGI transport). Detection
+is replaced by a fixed tracked result whose alert-class boxes get new
+track IDs every frame, so every frame raises alerts. The audio unit is a
+local TCP stub that answers after --delays seconds. A delay of -1 means
+it never answers, so the send runs into ESP32_TIMEOUT.
+
+"inline" reproduces the old response path: create a task per alert,
+then asyncio.wait(timeout=1.0) before replying. "dispatcher" is the
+current path.
+
+Usage (from Laptop_server/):
+    python benchmarks/bench_alerts.py --frames 30 --delays 0 0.3 -1
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import bench_utils  # noqa: F401  (sets up sys.path)
+from bench_utils import install_fixed_app, make_jpeg, start_audio_stub, summarize
+
+import httpx
+
+from server import AlertSinks, ESP32AlertClient, app, settings
+
+
+class CollectingDispatcher:
+    """Collects what process_frame submits so the old inline wait can run on it"""
+
+    def __init__(self):
+        self.pending = []
+
+    def submit(self, obj_class, distance, alert_type):
+        self.pending.append((obj_class, distance, alert_type))
+        return True
+
+
+async def old_alert_wait(dispatcher: CollectingDispatcher, client: ESP32AlertClient):
+    """The tail process_frame had before the dispatcher"""
+    alert_tasks = [
+        asyncio.create_task(client.send_alert(*alert))
+        for alert in dispatcher.pending
+    ]
+    dispatcher.pending.clear()
+    if alert_tasks:
+        done, pending = await asyncio.wait(alert_tasks, timeout=1.0)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def run_mode(mode: str, client: httpx.AsyncClient, frame: bytes, frames: int,
+                   drain_s: float, url: str) -> dict:
+    if mode == "inline":
+        dispatcher = CollectingDispatcher()
+        esp32 = ESP32AlertClient(url=url, transport="http")
+        await esp32.start()
+    else:
+        dispatcher = AlertSinks([{"name": "bench", "url": url, "transport": "http"}])
+        await dispatcher.start()
+    app.state.alert_sinks = dispatcher
+
+    samples = []
+    for i in range(frames):
+        start = time.perf_counter()
+        response = await client.post("/frame/raw", content=frame,
+                                     headers={"Content-Type": "image/jpeg",
+                                              "X-Device-ID": f"{mode}-cam"})
+        if mode == "inline":
+            await old_alert_wait(dispatcher, esp32)
+        samples.append((time.perf_counter() - start) * 1e6)
+        assert response.status_code == 200, response.text
+
+    stats = {k: round(v / 1000, 2) if k.endswith("_us") else v for k, v in summarize(samples).items()}
+    stats = {k.replace("_us", "_ms"): v for k, v in stats.items()}
+    if mode == "dispatcher":
+        # Give the backlog a moment to drain so delivery outcomes are visible
+        sink = dispatcher.dispatchers["bench"]
+        deadline = time.perf_counter() + drain_s
+        while sink.get_stats()["pending"] and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+        stats["alerts"] = sink.get_stats()
+        await dispatcher.stop()
+    else:
+        await esp32.stop()
+    return stats
+
+
+async def main_async(args):
+    settings.esp32_timeout = args.timeout
+    install_fixed_app(args.boxes, fresh_ids=True)  # run_mode swaps in the alert sinks
+    frame = make_jpeg(320, 240)
+
+    report = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for delay in args.delays:
+            server = await start_audio_stub(delay)
+            url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/alert"
+            label = "no_answer" if delay < 0 else f"delay_{delay}s"
+            report[label] = {
+                mode: await run_mode(mode, client, frame, args.frames, args.drain, url)
+                for mode in ("inline", "dispatcher")
+            }
+            server.close()
+    print(json.dumps(report, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--boxes", type=int, default=3, help="alerting boxes per frame")
+    parser.add_argument("--delays", type=float, nargs="+", default=[0.0, 0.3, -1.0])
+    parser.add_argument("--timeout", type=float, default=1.0, help="ESP32_TIMEOUT")
+    parser.add_argument("--drain", type=float, default=5.0,
+                        help="seconds to let queued alerts finish before reading outcomes")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""
+CPU inference backends: torch vs ONNX Runtime vs OpenVINO
+
+For every model/backend pair this measures load time (including a one-off
+export when the cache is cold), first-frame latency, and steady-state
+frames/s at batch size 1. Run it twice to see warm-cache load times.
+
+Usage (from Laptop_server/):
+    python benchmarks/bench_backends.py --models yolo11n.pt yolo11s.pt yolo11m.pt
+"""
+
+import argparse
+import json
+import time
+
+import bench_utils  # noqa: F401  (sets up sys.path)
+from bench_utils import make_jpeg, summarize
+
+import cv2
+import numpy as np
+
+from server import EXPORT_BACKENDS, load_model, settings
+
+
+def bench_backend(model_path: str, backend: str, img, iterations: int, imgsz: int) -> dict:
+    start = time.perf_counter()
+    model = load_model(model_path, backend, imgsz)
+    load_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model.predict(img, imgsz=imgsz, verbose=False)
+    first_frame_ms = (time.perf_counter() - start) * 1000
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        model.predict(img, imgsz=imgsz, verbose=False)
+        samples.append((time.perf_counter() - start) * 1e6)
+
+    stats = summarize(samples)
+    return {
+        "load_s": round(load_s, 2),
+        "first_frame_ms": round(first_frame_ms, 1),
+        "frames_per_s": round(1e6 / stats["mean_us"], 2),
+        "p50_ms": round(stats["p50_us"] / 1000, 1),
+        "p99_ms": round(stats["p99_us"] / 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--models", nargs="+", default=["yolo11n.pt", "yolo11s.pt", "yolo11m.pt"])
+    parser.add_argument("--backends", nargs="+", default=["torch", *EXPORT_BACKENDS])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--imgsz", type=int, default=settings.model_input_size)
+    args = parser.parse_args()
+
+    img = cv2.imdecode(np.frombuffer(make_jpeg(320, 240), np.uint8), cv2.IMREAD_COLOR)
+
+    report = {}
+    for model_path in args.models:
+        report[model_path] = {}
+        for backend in args.backends:
+            try:
+                report[model_path][backend] = bench_backend(
+                    model_path, backend, img, args.iterations, args.imgsz
+                )
+            except Exception as e:  # runtime not installed, export failed, ...
+                report[model_path][backend] = {"error": str(e)}
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""
+Cross-camera micro-batching: batch size 1 vs batched inference
+
+Drives InferenceWorker + run_batch with 1, 2, 4 and 8 simulated cameras.
+Every camera submits its next frame as soon as the previous one returns
+(closed loop), so the numbers show how much model time each frame costs.
+Reports frames/s, frames per CPU-second (throughput per core) and p50/p99
+submit-to-result latency.
+
+Usage (from Laptop_server/):
+    python benchmarks/bench_batching.py --seconds 15 --window-ms 15
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import bench_utils  # noqa: F401  (sets up sys.path)
+from bench_utils import make_jpeg, summarize
+
+import cv2
+import numpy as np
+
+from server import FRAME_DROPPED, InferenceWorker, app, load_model, predictor_filter, run_batch
+
+
+async def camera(worker: InferenceWorker, device_id: str, img, deadline: float, latencies: list):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        result = await worker.submit(device_id, img)
+        if result is not FRAME_DROPPED:
+            latencies.append((time.perf_counter() - start) * 1e6)
+
+
+async def run_config(model, label: str, cameras: int, img, seconds: float,
+                     window_ms: float, max_frames: int) -> dict:
+    worker = InferenceWorker([model], run_batch, batch_window_ms=window_ms,
+                             batch_max_frames=max_frames)
+    for i in range(cameras):
+        app.state.devices.touch(f"{label}-{i}")  # so each camera keeps its tracker
+    worker.start()
+    try:
+        # Warm up the model and every camera's tracker
+        await asyncio.gather(*(worker.submit(f"{label}-{i}", img) for i in range(cameras)))
+
+        latencies: list = []
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        deadline = wall_start + seconds
+        await asyncio.gather(*(
+            camera(worker, f"{label}-{i}", img, deadline, latencies)
+            for i in range(cameras)
+        ))
+        cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+        stats = worker.get_stats()
+    finally:
+        worker.stop()
+
+    frames = len(latencies)
+    return {
+        "frames_per_s": round(frames / wall, 2),
+        "frames_per_cpu_s": round(frames / cpu, 2) if cpu else 0.0,
+        "avg_batch_size": stats["avg_batch_size"],
+        **summarize(latencies),
+    }
+
+
+async def run(args) -> dict:
+    img = cv2.imdecode(np.frombuffer(make_jpeg(args.width, args.height), np.uint8),
+                       cv2.IMREAD_COLOR)
+    model = load_model()
+    app.state.predict_kwargs = predictor_filter({name: i for i, name in model.names.items()})
+    report = {}
+    for cameras in args.cameras:
+        report[f"{cameras}_cameras"] = {
+            "batch_1": await run_config(model, f"b1c{cameras}", cameras, img,
+                                        args.seconds, 0.0, 1),
+            "batched": await run_config(model, f"bnc{cameras}", cameras, img,
+                                        args.seconds, args.window_ms, args.max_frames),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cameras", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seconds", type=float, default=15.0)
+    parser.add_argument("--window-ms", type=float, default=15.0)
+    parser.add_argument("--max-frames", type=int, default=8)
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--height", type=int, default=240)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""
+Frame decode cost: PIL -> numpy -> cvtColor chain vs FrameDecoder
+
+Reports microseconds per frame and the Python-visible allocations made per
+decode (tracemalloc sees numpy/OpenCV output arrays; PIL's internal image
+buffers are C allocations and are not counted, so the old chain is
+under-reported if anything).
+
+Usage (from Laptop_server/):
+    python benchmarks/bench_decode.py --iterations 500
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from io import BytesIO
+
+import bench_utils  # noqa: F401  (sets up sys.path)
+from bench_utils import make_jpeg
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from server import FrameDecoder, settings
+
+RESOLUTIONS = {"QVGA": (320, 240), "VGA": (640, 480)}
+
+
+def old_decode(contents):
+    """The decode chain receive_frame used before FrameDecoder"""
+    img = Image.open(BytesIO(contents)).convert("RGB")
+    img_array = np.array(img)
+    return cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
+
+
+def new_decode(decoder: FrameDecoder):
+    def _decode(contents):
+        return decoder.decode(contents)[0]
+    return _decode
+
+
+def time_per_frame(fn, contents, iterations: int) -> float:
+    fn(contents)  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(contents)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def allocations_per_frame(fn, contents) -> dict:
+    fn(contents)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = fn(contents)  # keep the output alive so it shows in the snapshot
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = [s for s in after.compare_to(before, "traceback") if s.size_diff > 0]
+    large = [s for s in stats if s.size_diff >= 1024]
+    del result
+    return {
+        "large_allocs": sum(s.count_diff for s in large),
+        "retained_kb": round(sum(s.size_diff for s in stats) / 1024, 1),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--quality", type=int, default=80)
+    args = parser.parse_args()
+
+    decoder = FrameDecoder(settings.model_input_size, scaled=True)
+    candidates = {"pil_chain": old_decode, "frame_decoder": new_decode(decoder)}
+
+    report = {}
+    for label, (width, height) in RESOLUTIONS.items():
+        contents = make_jpeg(width, height, args.quality)
+        report[label] = {"jpeg_bytes": len(contents)}
+        for name, fn in candidates.items():
+            report[label][name] = {
+                "us_per_frame": round(time_per_frame(fn, contents, args.iterations), 1),
+                **allocations_per_frame(fn, contents),
+            }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
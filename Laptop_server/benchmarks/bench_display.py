@@ -0,0 +1,136 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""
+Request latency with the display: disabled vs inline drawing vs render thread
+
+Several simulated cameras post frames to /frame/raw concurrently, in
+process over the httpx ASGI transport. Detection is replaced by a fixed
+result with --boxes tracked boxes, and alerts are off. Three modes:
+- "disabled": no window
+- "inline": the old path, drawing plus imshow/waitKey inside the request
+- "thread": the DisplayRenderer render thread
+
+Without a GUI (headless OpenCV, no $DISPLAY) imshow/waitKey are
+simulated. imshow becomes a frame copy, and waitKey sleeps for its delay
+plus --gui-cost-ms. The report says which one ran.
+
+Usage (from Laptop_server/):
+    python benchmarks/bench_display.py --cameras 4 --frames 100
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import bench_utils  # noqa: F401  (sets up sys.path)
+from bench_utils import install_fixed_app, make_jpeg, summarize
+
+import cv2
+import httpx
+import numpy as np
+
+from server import DisplayRenderer, app, render_frame
+
+
+class InlineRenderer:
+    """The old display_frame: all drawing and GUI calls in the request"""
+
+    def submit(self, img_array, detections, scale: float = 1.0):
+        cv2.imshow(DisplayRenderer.WINDOW, render_frame(img_array, detections, scale))
+        cv2.waitKey(1)
+
+    def stop(self):
+        cv2.destroyAllWindows()
+
+
+def use_gui_or_simulate(gui_cost_ms: float) -> str:
+    # Qt builds abort the process (not just raise) when there is no display
+    has_display = sys.platform in ("win32", "darwin") or any(
+        os.environ.get(var) for var in ("DISPLAY", "WAYLAND_DISPLAY")
+    )
+    if has_display:
+        try:
+            cv2.imshow("probe", np.zeros((8, 8, 3), np.uint8))
+            cv2.waitKey(1)
+            cv2.destroyAllWindows()
+            return "opencv highgui"
+        except cv2.error:  # headless OpenCV build
+            pass
+
+    cv2.imshow = lambda name, img: img.copy()
+    cv2.waitKey = lambda delay=0: time.sleep((max(delay, 1) + gui_cost_ms) / 1000) or -1
+    cv2.destroyAllWindows = lambda: None
+    return f"simulated (waitKey = delay + {gui_cost_ms} ms)"
+
+
+async def camera(client: httpx.AsyncClient, name: str, frame: bytes, frames: int, samples: list):
+    for _ in range(frames):
+        start = time.perf_counter()
+        response = await client.post("/frame/raw", content=frame,
+                                     headers={"Content-Type": "image/jpeg", "X-Device-ID": name})
+        samples.append((time.perf_counter() - start) * 1e6)
+        assert response.status_code == 200, response.text
+
+
+async def run_mode(mode: str, client: httpx.AsyncClient, frame: bytes, args) -> dict:
+    app.state.display_enabled = mode != "disabled"
+    renderer = None
+    if mode == "inline":
+        renderer = app.state.renderer = InlineRenderer()
+    elif mode == "thread":
+        renderer = app.state.renderer = DisplayRenderer(args.max_fps)
+        renderer.start(asyncio.get_running_loop())
+
+    samples: list = []
+    wall = time.perf_counter()
+    await asyncio.gather(*(
+        camera(client, f"{mode}-{i}", frame, args.frames, samples) for i in range(args.cameras)
+    ))
+    wall = time.perf_counter() - wall
+    stats = summarize(samples)
+    report = {
+        "frames_per_s": round(len(samples) / wall, 1),
+        "mean_ms": round(stats["mean_us"] / 1000, 2),
+        "p50_ms": round(stats["p50_us"] / 1000, 2),
+        "p99_ms": round(stats["p99_us"] / 1000, 2),
+    }
+    if isinstance(renderer, DisplayRenderer):
+        report["renderer"] = renderer.get_stats()
+    if renderer is not None:
+        renderer.stop()
+    return report
+
+
+async def main_async(args):
+    gui = use_gui_or_simulate(args.gui_cost_ms)
+    install_fixed_app(args.boxes)
+    frame = make_jpeg(args.width, args.height)
+
+    report = {"gui": gui, "cameras": args.cameras}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for mode in ("disabled", "inline", "thread"):
+            report[mode] = await run_mode(mode, client, frame, args)
+    print(json.dumps(report, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--frames", type=int, default=100, help="frames per camera")
+    parser.add_argument("--boxes", type=int, default=10)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--max-fps", type=float, default=15.0)
+    parser.add_argument("--gui-cost-ms", type=float, default=5.0,
+                        help="simulated HighGUI cost per waitKey when no display is available")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
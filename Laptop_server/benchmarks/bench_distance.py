@@ -0,0 +1,84 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""
+DistanceEstimator: per-box scalar calls vs one estimate_distances call
+
+First checks that the scalar and batch methods agree exactly on random
+boxes (tests/test_distance.py covers the edge cases), then times both
+paths.
+
+Usage (from Laptop_server/):
+    python benchmarks/bench_distance.py --iterations 2000
+"""
+
+import argparse
+import json
+import time
+
+import bench_utils  # noqa: F401  (sets up sys.path)
+
+import numpy as np
+from ultralytics.utils.checks import check_yaml
+
+from server import DistanceEstimator, load_yaml
+
+
+def random_boxes(count: int, num_classes: int, seed: int = 0) -> tuple:
+    rng = np.random.default_rng(seed)
+    x1 = rng.uniform(0, 600, count)
+    y1 = rng.uniform(0, 440, count)
+    heights = rng.uniform(-5, 300, count)  # includes zero/negative heights
+    heights[::17] = 0.0
+    boxes = np.stack([x1, y1, x1 + rng.uniform(1, 80, count), y1 + heights], axis=1)
+    class_ids = rng.integers(0, num_classes, count)
+    return boxes.astype(np.float32), class_ids
+
+
+def check_agreement(estimator: DistanceEstimator, names: dict, count: int = 5000):
+    boxes, class_ids = random_boxes(count, len(names), seed=1)
+    batch = estimator.estimate_distances(boxes, class_ids)
+    scalar = np.array([
+        estimator.estimate_distance(box, names[class_id])
+        for box, class_id in zip(boxes.tolist(), class_ids.tolist())
+    ])
+    np.testing.assert_array_equal(batch, scalar, err_msg="batch and scalar distances differ")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--counts", type=int, nargs="+", default=[5, 50, 300])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    names = load_yaml(check_yaml("coco.yaml"))["names"]
+    estimator = DistanceEstimator(names)
+    check_agreement(estimator, names)
+
+    report = {"agreement": "ok"}
+    for count in args.counts:
+        boxes, class_ids = random_boxes(count, len(names))
+        rows = list(zip(boxes.tolist(), [names[c] for c in class_ids.tolist()]))
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            [estimator.estimate_distance(box, name) for box, name in rows]
+        scalar_us = (time.perf_counter() - start) / args.iterations * 1e6
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            estimator.estimate_distances(boxes, class_ids)
+        batch_us = (time.perf_counter() - start) / args.iterations * 1e6
+
+        report[f"{count}_boxes"] = {
+            "scalar_us": round(scalar_us, 1),
+            "batch_us": round(batch_us, 1),
+            "speedup": round(scalar_us / batch_us, 2),
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""
+Per-frame ingest overhead: multipart UploadFile vs raw image/jpeg body
+
+Runs both ingest styles in-process (httpx ASGI transport, no sockets) with
+N simulated cameras, each pacing itself at the given FPS, and times the
+server side of every request (body parsing + handler) with an ASGI wrapper.
+Only ingest is measured; detection is not run.
+
+Usage (from Laptop_server/):
+    python benchmarks/bench_ingest.py --cameras 4 --seconds 10
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import bench_utils  # noqa: F401  (sets up sys.path)
+from bench_utils import make_jpeg, summarize
+
+import httpx
+from fastapi import FastAPI, File, Request, UploadFile
+from fastapi.responses import JSONResponse
+
+from server import FrameBufferPool, _content_length, read_raw_body
+
+
+class TimedASGI:
+    """Record wall time of every request handled by the wrapped app"""
+
+    def __init__(self, app):
+        self.app = app
+        self.samples = {"multipart": [], "raw": []}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        await self.app(scope, receive, send)
+        kind = "raw" if scope["path"].endswith("/raw") else "multipart"
+        self.samples[kind].append((time.perf_counter() - start) * 1e6)
+
+
+def build_app() -> FastAPI:
+    bench_app = FastAPI()
+    pool = FrameBufferPool()
+
+    @bench_app.post("/frame")
+    async def multipart_frame(file: UploadFile = File(...)):
+        contents = await file.read()
+        return JSONResponse({"success": True, "bytes": len(contents)})
+
+    @bench_app.post("/frame/raw")
+    async def raw_frame(request: Request):
+        buf = pool.acquire(_content_length(request))
+        try:
+            size = await read_raw_body(request, buf)
+            return JSONResponse({"success": True, "bytes": size})
+        finally:
+            pool.release(buf)
+
+    return bench_app
+
+
+async def camera(client: httpx.AsyncClient, kind: str, frame: bytes, fps: float, seconds: float):
+    interval = 1.0 / fps
+    deadline = time.perf_counter() + seconds
+    next_send = time.perf_counter()
+    while next_send < deadline:
+        if kind == "raw":
+            await client.post("/frame/raw", content=frame,
+                              headers={"Content-Type": "image/jpeg"})
+        else:
+            await client.post("/frame", files={"file": ("frame.jpg", frame, "image/jpeg")})
+        next_send += interval
+        await asyncio.sleep(max(0.0, next_send - time.perf_counter()))
+
+
+async def run(args) -> dict:
+    frame = make_jpeg(args.width, args.height)
+    report = {"frame_bytes": len(frame), "cameras": args.cameras, "results": {}}
+
+    for fps in args.fps:
+        for kind in ("multipart", "raw"):
+            timed = TimedASGI(build_app())
+            transport = httpx.ASGITransport(app=timed)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                await asyncio.gather(*(
+                    camera(client, kind, frame, fps, args.seconds)
+                    for _ in range(args.cameras)
+                ))
+            report["results"][f"{kind}@{fps:g}fps"] = summarize(timed.samples[kind])
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--fps", type=float, nargs="+", default=[5.0, 10.0])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--height", type=int, default=240)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""
+Logging call latency with a slow disk: direct handlers vs LogQueueHandler
+
+The disk is a stand-in stream whose every write sleeps --disk-ms, as a
+busy SD card or spinning disk on the laptop would. The workload mixes
+the server's two noisy cases:
+- unique per-alert warnings ("🔊 PRESENCE ALERT ... → car #17 1.23m")
+- bursts of one identical error ("Cannot connect to ESP32 at ...")
+--error-share sets the fraction of records that are the repeated error.
+
+"direct" is the old layout: handlers attached straight to the logger,
+so the caller does the write. "queued" is setup_logging's layout now.
+There the caller only enqueues, and a QueueListener thread writes.
+Repeated errors are collapsed by the DuplicateFilter. The report has:
+- the per-call latency seen by the caller
+- how long the writer thread then needs to drain
+- how many lines reached the disk
+
+Usage (from Laptop_server/):
+    python benchmarks/bench_logging.py --records 2000 --disk-ms 2
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+
+import bench_utils  # noqa: F401  (sets up sys.path)
+from bench_utils import summarize
+
+from server import LogQueueHandler
+
+
+class SlowStream:
+    """A file whose writes each take --disk-ms"""
+
+    def __init__(self, path: str, delay_s: float):
+        self.file = open(path, "w", encoding="utf-8")
+        self.delay_s = delay_s
+        self.lines = 0
+
+    def write(self, text: str):
+        time.sleep(self.delay_s)
+        self.lines += text.count("\n")
+        return self.file.write(text)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def workload(records: int, error_share: float, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [
+        (logging.ERROR, "Cannot connect to ESP32 at http://192.168.1.50/alert")
+        if rng.random() < error_share else
+        (logging.WARNING, f"🔊 PRESENCE ALERT [audio] → car #{i} {1 + i % 400 / 100:.2f}m")
+        for i in range(records)
+    ]
+
+
+def run_mode(mode: str, records: list, delay_s: float, directory: str) -> dict:
+    stream = SlowStream(os.path.join(directory, f"{mode}.log"), delay_s)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter('%(asctime)s | %(levelname)-8s | %(message)s'))
+
+    logger = logging.getLogger(f"bench_logging.{mode}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    queue_handler = None
+    if mode == "direct":
+        logger.addHandler(handler)
+    else:
+        queue_handler = LogQueueHandler()
+        queue_handler.start(handler)
+        logger.addHandler(queue_handler)
+
+    samples = []
+    wall = time.perf_counter()
+    for level, message in records:
+        start = time.perf_counter()
+        logger.log(level, message)
+        samples.append((time.perf_counter() - start) * 1e6)
+    calls_s = time.perf_counter() - wall
+
+    drain = time.perf_counter()
+    report = {}
+    if queue_handler is not None:
+        report = queue_handler.get_stats()
+        queue_handler.stop()
+    drain_s = time.perf_counter() - drain
+    logger.removeHandler(queue_handler or handler)
+    stream.close()
+
+    stats = summarize(samples)
+    return {
+        "call_mean_us": stats["mean_us"],
+        "call_p50_us": stats["p50_us"],
+        "call_p99_us": stats["p99_us"],
+        "call_max_us": round(max(samples), 1),
+        "calls_total_s": round(calls_s, 3),
+        "drain_s": round(drain_s, 3),
+        "lines_written": stream.lines,
+        **{key: report[key] for key in ("dropped", "duplicates_suppressed") if key in report},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--disk-ms", type=float, default=2.0, help="time each write takes")
+    parser.add_argument("--error-share", type=float, default=0.5,
+                        help="fraction of records that are the same repeated error")
+    args = parser.parse_args()
+
+    records = workload(args.records, args.error_share)
+    report = {"records": args.records, "disk_ms": args.disk_ms}
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in ("direct", "queued"):
+            report[mode] = run_mode(mode, records, args.disk_ms / 1000, directory)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""
+ObjectMemory churn: min()-scan eviction vs ordered LRU eviction
+
+Pushes 10k-100k distinct track IDs through a full (MAX_TRACKS) memory.
+Each ID is updated a few times, the way a tracker re-reports an object on
+consecutive frames. The script times update() and cleanup_stale_tracks()
+for the old dict + min() version and for the current ObjectMemory. It
+also checks that both versions return the same alerts and evict the
+same tracks.
+
+It then fills a memory with MAX_TRACKS tracks under tracemalloc. This
+compares the per-track footprint of the old dict-of-dicts with the
+TrackRecord slots, and checks the O(1) figure get_stats() reports
+against the measured one.
+
+Usage (from Laptop_server/):
+    python benchmarks/bench_memory.py --tracks 10000 100000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+import tracemalloc
+
+import bench_utils  # noqa: F401  (sets up sys.path)
+
+import numpy as np
+
+from server import ObjectMemory, settings
+
+# Eviction warnings would dominate the timings; only the data structure is measured
+logging.getLogger("yolo_server").setLevel(logging.ERROR)
+
+
+class OldObjectMemory:
+    """The dict + min() ObjectMemory from before the ordered rewrite"""
+
+    def __init__(self):
+        self._memory = {}
+        self._lock = asyncio.Lock()
+
+    async def update(self, track_id, distance):
+        async with self._lock:
+            now = time.time()
+            if track_id not in self._memory:
+                if len(self._memory) >= ObjectMemory.MAX_TRACKS:
+                    oldest_id = min(self._memory.items(), key=lambda x: x[1]['last_seen'])[0]
+                    del self._memory[oldest_id]
+                self._memory[track_id] = {
+                    "seen": True, "last_distance": distance, "last_alert_time": 0,
+                    "last_seen": now, "first_seen": now,
+                }
+                return "presence"
+            obj = self._memory[track_id]
+            prev_distance = obj["last_distance"]
+            last_alert = obj["last_alert_time"]
+            obj["last_distance"] = distance
+            obj["last_seen"] = now
+            if distance >= prev_distance:
+                return None
+            if distance <= settings.danger_distance_m:
+                if now - last_alert >= settings.alert_cooldown:
+                    obj["last_alert_time"] = now
+                    return "approaching"
+            return None
+
+    async def cleanup_stale_tracks(self):
+        async with self._lock:
+            now = time.time()
+            stale_ids = [
+                track_id for track_id, obj in self._memory.items()
+                if now - obj["last_seen"] > settings.memory_max_age
+            ]
+            for track_id in stale_ids:
+                del self._memory[track_id]
+
+
+def churn_schedule(tracks: int, repeats: int, seed: int = 0) -> list:
+    """(track_id, distance) updates: a sliding window of live IDs, each seen `repeats` times"""
+    rng = np.random.default_rng(seed)
+    live = 64  # objects visible at once
+    schedule = []
+    for start in range(0, tracks, live):
+        ids = range(start, min(start + live, tracks))
+        for _ in range(repeats):
+            for track_id in ids:
+                schedule.append((track_id, float(rng.uniform(0.5, 10.0))))
+    return schedule
+
+
+async def run_updates(memory, schedule: list) -> tuple:
+    alerts = []
+    start = time.perf_counter()
+    for track_id, distance in schedule:
+        alerts.append(await memory.update(track_id, distance))
+    return time.perf_counter() - start, alerts
+
+
+async def time_cleanup(memory_cls, iterations: int) -> float:
+    """Cleanup of a full memory where nothing is stale (the common case)"""
+    memory = memory_cls()
+    for track_id in range(ObjectMemory.MAX_TRACKS):
+        await memory.update(track_id, 5.0)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await memory.cleanup_stale_tracks()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def measure_footprint(memory_cls) -> tuple:
+    """(bytes per track measured by tracemalloc, the memory object)"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    memory = memory_cls()
+    for track_id in range(ObjectMemory.MAX_TRACKS):
+        await memory.update(track_id + (1 << 20), 5.0 + track_id * 1e-3)
+    measured = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return measured, memory
+
+
+async def main_async(args):
+    report = {}
+    for tracks in args.tracks:
+        schedule = churn_schedule(tracks, args.repeats)
+        old_memory, new_memory = OldObjectMemory(), ObjectMemory()
+        old_s, old_alerts = await run_updates(old_memory, schedule)
+        new_s, new_alerts = await run_updates(new_memory, schedule)
+        assert old_alerts == new_alerts, "alert sequences differ"
+        assert set(old_memory._memory) == set(new_memory._memory), "evicted tracks differ"
+
+        report[f"{tracks}_tracks"] = {
+            "updates": len(schedule),
+            "old_us_per_update": round(old_s / len(schedule) * 1e6, 2),
+            "new_us_per_update": round(new_s / len(schedule) * 1e6, 2),
+            "speedup": round(old_s / new_s, 2),
+        }
+
+    old_cleanup = await time_cleanup(OldObjectMemory, args.cleanup_iterations)
+    new_cleanup = await time_cleanup(ObjectMemory, args.cleanup_iterations)
+    report["cleanup_full_memory"] = {
+        "old_us": round(old_cleanup, 1),
+        "new_us": round(new_cleanup, 1),
+    }
+
+    old_bytes, _ = await measure_footprint(OldObjectMemory)
+    new_bytes, new_memory = await measure_footprint(ObjectMemory)
+    reported = (await new_memory.get_stats())["memory_size_bytes"]
+    report["footprint"] = {
+        "tracks": ObjectMemory.MAX_TRACKS,
+        "old_bytes_per_track": round(old_bytes / ObjectMemory.MAX_TRACKS, 1),
+        "new_bytes_per_track": round(new_bytes / ObjectMemory.MAX_TRACKS, 1),
+        "new_measured_bytes": new_bytes,
+        "new_reported_bytes": reported,
+    }
+    print(json.dumps(report, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tracks", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeats", type=int, default=3, help="updates per track ID")
+    parser.add_argument("--cleanup-iterations", type=int, default=200)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""
+Cost of the per-stage metrics and frame tracing on the frame path
+
+Four measurements:
+- "per_frame": the exact sequence of Metrics calls one frame makes
+  (7 laps, the alert counter and frame_done), timed in a tight loop
+  against the same sequence on a no-op Metrics. This is the overhead.
+- "trace": recording the frame in the FrameTracer ring buffer and
+  formatting its Server-Timing header.
+- "requests": /frame/raw round trips in process over the httpx ASGI
+  transport. One side uses real Metrics and a FrameTracer. The other
+  uses a no-op Metrics and no trace buffer. Detection is replaced by a
+  fixed result. This shows whether the overhead is visible at all.
+- "render": how long one /metrics scrape takes to format.
+
+Usage (from Laptop_server/):
+    python benchmarks/bench_metrics.py --iterations 200000 --frames 500
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import bench_utils  # noqa: F401  (sets up sys.path)
+from bench_utils import install_fixed_app, make_jpeg, summarize
+
+import httpx
+
+from server import FRAME_STAGES, FrameTracer, Metrics, app, server_timing
+
+
+class NullMetrics(Metrics):
+    """Same interface, records nothing"""
+
+    def lap(self, stage: str, start: float, timings: list) -> float:
+        return start
+
+    def frame_done(self, outcome: str, started: float) -> float:
+        return 0.0
+
+
+def frame_sequence(metrics: Metrics, iterations: int) -> float:
+    """Mean µs for the Metrics calls of one frame"""
+    stages = FRAME_STAGES
+    start = time.perf_counter()
+    for _ in range(iterations):
+        started = t = time.perf_counter()
+        timings = []
+        for stage in stages:
+            t = metrics.lap(stage, t, timings)
+        metrics.alerts_submitted += 0
+        metrics.frame_done("ok", started)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def trace_sequence(tracer: FrameTracer, iterations: int) -> float:
+    """Mean µs to record one frame's trace and format its Server-Timing"""
+    timings = [(stage, 0.001) for stage in FRAME_STAGES]
+    start = time.perf_counter()
+    for _ in range(iterations):
+        frame_id = tracer.next_id()
+        tracer.record(frame_id, "cam", "ok", 0.03, timings, 10, 0)
+        server_timing(timings, 0.03)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def time_requests(client: httpx.AsyncClient, frame: bytes, frames: int) -> dict:
+    samples = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        response = await client.post("/frame/raw", content=frame,
+                                     headers={"Content-Type": "image/jpeg", "X-Device-ID": "cam"})
+        samples.append((time.perf_counter() - start) * 1e6)
+        assert response.status_code == 200, response.text
+    return summarize(samples)
+
+
+async def main_async(args):
+    report = {}
+    null = frame_sequence(NullMetrics(), args.iterations)
+    real = frame_sequence(Metrics(), args.iterations)
+    report["per_frame"] = {
+        "null_us": round(null, 3),
+        "metrics_us": round(real, 3),
+        "overhead_us": round(real - null, 3),
+    }
+    report["trace"] = {
+        "record_and_header_us": round(trace_sequence(FrameTracer(512), args.iterations), 3)
+    }
+
+    install_fixed_app(args.boxes)
+    frame = make_jpeg(args.width, args.height)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await time_requests(client, frame, 20)  # warm up
+        report["requests"] = {}
+        # Alternate so drift (thermal, GC) hits both sides evenly
+        runs = {"null": [], "metrics": []}
+        for _ in range(args.rounds):
+            for label, cls, trace_size in (("null", NullMetrics, 0), ("metrics", Metrics, 512)):
+                app.state.metrics = cls()
+                app.state.tracer = FrameTracer(trace_size)
+                runs[label].append(await time_requests(client, frame, args.frames))
+        for label, stats in runs.items():
+            report["requests"][label] = {
+                key: round(sum(s[key] for s in stats) / len(stats), 1)
+                for key in ("mean_us", "p50_us", "p99_us")
+            }
+
+        app.state.metrics = Metrics()
+        await time_requests(client, frame, args.frames)
+        samples = []
+        for _ in range(200):
+            start = time.perf_counter()
+            response = await client.get("/metrics")
+            samples.append((time.perf_counter() - start) * 1e6)
+        render = []
+        for _ in range(200):
+            start = time.perf_counter()
+            app.state.metrics.render(app.state.alert_sinks)
+            render.append((time.perf_counter() - start) * 1e6)
+        report["render"] = {
+            "format_us": summarize(render)["p50_us"],
+            "scrape_us": summarize(samples)["p50_us"],
+            "bytes": len(response.content),
+        }
+    print(json.dumps(report, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--frames", type=int, default=200, help="requests per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--boxes", type=int, default=10)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
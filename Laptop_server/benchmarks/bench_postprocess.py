@@ -0,0 +1,128 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""
+Detection post-processing: per-box tensor indexing vs postprocess_result
+
+Builds synthetic tracked results with 5, 50 and 300 boxes (a mix of alert
+and non-alert COCO classes, some below the confidence threshold) and
+times the old per-box loop against the array-based postprocess_result.
+Both paths must first give the same detections, field by field, and the
+same alert rows.
+
+Usage (from Laptop_server/):
+    python benchmarks/bench_postprocess.py --iterations 2000
+"""
+
+import argparse
+import json
+import time
+
+import bench_utils  # noqa: F401  (sets up sys.path)
+
+import numpy as np
+import torch
+from ultralytics.engine.results import Results
+from ultralytics.utils.checks import check_yaml
+
+from server import ALERT_CLASSES, DistanceEstimator, load_yaml, postprocess_result, settings
+
+
+def make_result(count: int, names: dict, seed: int = 0) -> Results:
+    rng = np.random.default_rng(seed)
+    x1 = rng.uniform(0, 280, count)
+    y1 = rng.uniform(0, 200, count)
+    data = np.stack([
+        x1, y1,
+        x1 + rng.uniform(5, 40, count),
+        y1 + rng.uniform(5, 40, count),
+        np.arange(1, count + 1),                 # track id
+        rng.uniform(0.2, 1.0, count),            # conf
+        rng.integers(0, len(names), count),      # cls
+    ], axis=1).astype(np.float32)
+    orig = np.zeros((240, 320, 3), dtype=np.uint8)
+    return Results(orig, path="bench.jpg", names=names, boxes=torch.from_numpy(data))
+
+
+def old_postprocess(result, names, estimator):
+    """The per-box loop receive_frame used before postprocess_result"""
+    detections, alert_rows = [], []
+    for box in result.boxes:
+        class_name = names[int(box.cls[0])]
+        confidence = float(box.conf[0])
+        if confidence < settings.confidence_threshold:
+            continue
+        track_id = int(box.id[0]) if box.id is not None else None
+        bbox = box.xyxy[0].tolist()
+        distance = estimator.estimate_distance(bbox, class_name)
+        detections.append({
+            "class": class_name,
+            "confidence": confidence,
+            "bbox": bbox,
+            "track_id": track_id,
+            "distance": distance
+        })
+        if class_name in ALERT_CLASSES and track_id is not None:
+            alert_rows.append((track_id, distance, class_name))
+    return detections, alert_rows
+
+
+def check_same(old: tuple, new: tuple):
+    """The old loop and postprocess_result agree on every detection field"""
+    old_detections, old_alerts = old
+    new_detections, new_alerts = new
+    assert len(old_detections) == len(new_detections), "different number of detections"
+    for i, (a, b) in enumerate(zip(old_detections, new_detections)):
+        assert a["class"] == b["class"], f"detection {i}: class differs"
+        assert a["track_id"] == b["track_id"], f"detection {i}: track_id differs"
+        for field in ("confidence", "bbox", "distance"):
+            np.testing.assert_allclose(b[field], a[field], rtol=1e-6,
+                                       err_msg=f"detection {i}: {field} differs")
+    assert [(t, c) for t, _, c in old_alerts] == [(t, c) for t, _, c in new_alerts], \
+        "alert rows differ"
+    np.testing.assert_allclose([d for _, d, _ in new_alerts], [d for _, d, _ in old_alerts],
+                               rtol=1e-6, err_msg="alert distances differ")
+
+
+def time_us(fn, iterations: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--counts", type=int, nargs="+", default=[5, 50, 300])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    names = load_yaml(check_yaml("coco.yaml"))["names"]
+    class_ids = {name: class_id for class_id, name in names.items()}
+    alert_ids = np.array([class_ids[n] for n in ALERT_CLASSES], dtype=np.int64)
+    estimator = DistanceEstimator(names)
+
+    report = {}
+    for count in args.counts:
+        result = make_result(count, names)
+
+        check_same(old_postprocess(result, names, estimator),
+                   postprocess_result(result, names, alert_ids, estimator))
+
+        per_box = time_us(lambda: old_postprocess(result, names, estimator), args.iterations)
+        arrays = time_us(lambda: postprocess_result(result, names, alert_ids, estimator),
+                         args.iterations)
+        report[f"{count}_boxes"] = {
+            "kept": len(postprocess_result(result, names, alert_ids, estimator)[0]),
+            "per_box_us": round(per_box, 1),
+            "arrays_us": round(arrays, 1),
+            "speedup": round(per_box / arrays, 2),
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
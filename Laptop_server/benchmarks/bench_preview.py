@@ -0,0 +1,153 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""
+Server CPU cost of the /preview MJPEG stream by number of viewers
+
+Starts the server in a child process with detection replaced by a fixed
+result with --boxes tracked boxes, and alerts and the display off. The
+parent process does two things for --seconds per run:
+- posts frames to /frame/raw from --cameras cameras at --fps each
+- keeps 0, 1, 2, ... viewers reading /preview?device=cam-0
+
+It reads the child's CPU time from /proc (Linux only). With no viewers
+the preview path should cost nothing, and each extra viewer of the same
+camera should add almost nothing, because the frame is encoded once and
+shared.
+
+Usage (from Laptop_server/):
+    python benchmarks/bench_preview.py --viewers 0 1 2 4 --seconds 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import bench_utils  # noqa: F401  (sets up sys.path)
+from bench_utils import install_fixed_app, make_jpeg
+
+import httpx
+
+
+def cpu_seconds(pid: int) -> float:
+    """utime + stime of a process, from /proc/<pid>/stat"""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve(port: int, boxes: int):
+    """Child process: the real app with a fixed detector"""
+    import uvicorn
+
+    from server import app
+
+    install_fixed_app(boxes)
+    # lifespan off: no model load, no display window, no alert clients
+    uvicorn.run(app, host="127.0.0.1", port=port, lifespan="off", log_level="warning")
+
+
+async def camera(client: httpx.AsyncClient, name: str, frame: bytes, fps: float, until: float):
+    sent, next_at = 0, time.monotonic()
+    while time.monotonic() < until:
+        await client.post("/frame/raw", content=frame,
+                          headers={"Content-Type": "image/jpeg", "X-Device-ID": name})
+        sent += 1
+        next_at += 1 / fps
+        await asyncio.sleep(max(0.0, next_at - time.monotonic()))
+    return sent
+
+
+async def viewer(client: httpx.AsyncClient, counts: list, index: int):
+    async with client.stream("GET", "/preview", params={"device": "cam-0"}) as response:
+        assert response.status_code == 200, response.status_code
+        async for chunk in response.aiter_bytes():
+            counts[index] += chunk.count(b"--frame")
+
+
+async def run(client: httpx.AsyncClient, pid: int, viewers: int, frame: bytes, args) -> dict:
+    counts = [0] * viewers
+    viewer_tasks = [asyncio.create_task(viewer(client, counts, i)) for i in range(viewers)]
+    await asyncio.sleep(0.5)  # let the streams open before measuring
+
+    cpu, wall = cpu_seconds(pid), time.monotonic()
+    until = wall + args.seconds
+    sent = await asyncio.gather(*(
+        camera(client, f"cam-{i}", frame, args.fps, until) for i in range(args.cameras)
+    ))
+    cpu, wall = cpu_seconds(pid) - cpu, time.monotonic() - wall
+
+    stats = (await client.get("/stats")).json()["preview"]
+    for task in viewer_tasks:
+        task.cancel()
+    await asyncio.gather(*viewer_tasks, return_exceptions=True)
+    await asyncio.sleep(0.5)  # let the server notice the disconnects
+    return {
+        "server_cpu_pct": round(100 * cpu / wall, 1),
+        "frames_posted": sum(sent),
+        "frames_per_viewer": round(sum(counts) / viewers, 1) if viewers else 0,
+        "preview": stats,
+    }
+
+
+async def main_async(args):
+    port = free_port()
+    child = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", str(port),
+                              "--boxes", str(args.boxes)])
+    try:
+        limits = httpx.Limits(max_connections=args.cameras + max(args.viewers) + 4)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=30,
+                                     limits=limits) as client:
+            for _ in range(300):
+                if child.poll() is not None:
+                    raise SystemExit("server process exited during startup")
+                try:
+                    await client.get("/")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.2)
+            frame = make_jpeg(args.width, args.height)
+            report = {"cameras": args.cameras, "fps": args.fps}
+            for viewers in args.viewers:
+                report[f"{viewers}_viewers"] = await run(client, child.pid, viewers, frame, args)
+            base = report[f"{args.viewers[0]}_viewers"]["server_cpu_pct"]
+            for viewers in args.viewers[1:]:
+                extra = report[f"{viewers}_viewers"]["server_cpu_pct"] - base
+                report[f"{viewers}_viewers"]["extra_cpu_pct"] = round(extra, 1)
+        print(json.dumps(report, indent=2))
+    finally:
+        child.terminate()
+        child.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--viewers", type=int, nargs="+", default=[0, 1, 2, 4])
+    parser.add_argument("--cameras", type=int, default=2)
+    parser.add_argument("--fps", type=float, default=15.0, help="frames per second per camera")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--boxes", type=int, default=10)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--serve", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve is not None:
+        serve(args.serve, args.boxes)
+    else:
+        asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
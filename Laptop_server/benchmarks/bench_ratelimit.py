@@ -0,0 +1,99 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""
+RateLimiter: datetime-list sliding window vs monotonic token bucket
+
+Hammers both limiters with thousands of checks per second spread over
+many client IDs. It reports:
+- the cost of each check
+- the number of clients each limiter still holds at the end
+- how many checks each limiter allowed
+
+The old limiter only drops clients in its cleanup task, which is not
+running here.
+
+Usage (from Laptop_server/):
+    python benchmarks/bench_ratelimit.py --clients 10 1000 10000 --checks 200000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import bench_utils  # noqa: F401  (sets up sys.path)
+from bench_utils import summarize
+
+import numpy as np
+
+from server import RateLimiter
+
+
+class OldRateLimiter:
+    """The datetime-list limiter from before the token bucket"""
+
+    def __init__(self, max_requests: int, window_seconds: int):
+        self.max_requests = max_requests
+        self.window = timedelta(seconds=window_seconds)
+        self.requests = defaultdict(list)
+        self._lock = asyncio.Lock()
+
+    async def check_rate_limit(self, client_id: str) -> bool:
+        async with self._lock:
+            now = datetime.now()
+            self.requests[client_id] = [
+                req_time for req_time in self.requests[client_id]
+                if now - req_time < self.window
+            ]
+            if len(self.requests[client_id]) >= self.max_requests:
+                return False
+            self.requests[client_id].append(now)
+            return True
+
+
+async def hammer(limiter, client_ids: list) -> dict:
+    samples, allowed = [], 0
+    for client_id in client_ids:
+        start = time.perf_counter()
+        allowed += await limiter.check_rate_limit(client_id)
+        samples.append((time.perf_counter() - start) * 1e6)
+    stats = summarize(samples)
+    stats["allowed"] = allowed
+    stats["checks_per_s"] = round(1e6 / stats["mean_us"]) if stats["mean_us"] else None
+    return stats
+
+
+async def main_async(args):
+    report = {}
+    for clients in args.clients:
+        rng = np.random.default_rng(0)
+        # Zipf-ish traffic: a few chatty cameras and a long tail
+        ids = [f"cam-{i}" for i in (rng.zipf(1.3, args.checks) % clients)]
+
+        old = OldRateLimiter(args.limit, args.window)
+        new = RateLimiter(args.limit, args.window)
+        old_stats = await hammer(old, ids)
+        new_stats = await hammer(new, ids)
+
+        report[f"{clients}_clients"] = {
+            "old": {**old_stats, "clients_held": len(old.requests)},
+            "new": {**new_stats, "clients_held": new.get_stats()["clients"]},
+        }
+    print(json.dumps(report, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--checks", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=30)
+    parser.add_argument("--window", type=float, default=60)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""
+Alert transport latency over loopback: HTTP POST vs UDP datagram
+
+Sends the same alerts through ESP32AlertClient three ways:
+- HTTP, to a local stand-in of the audio unit's /alert endpoint
+- UDP presence alerts, which are fire-and-forget
+- UDP fall alerts, which are acked
+
+The UDP paths go to udp_alert_receiver.UDPAlertReceiver. The acked UDP
+fall alert is the like-for-like comparison with an HTTP request/response.
+--drop makes the receiver ignore a fraction of datagrams, to show what
+ack/retry costs under loss.
+
+Usage (from Laptop_server/):
+    python benchmarks/bench_transport.py --alerts 2000 --drop 0 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+import bench_utils  # noqa: F401  (sets up sys.path)
+from bench_utils import start_audio_stub, summarize
+
+from server import ESP32AlertClient, settings
+from udp_alert_receiver import start_receiver
+
+# Per-alert log lines would dominate loopback timings
+logging.getLogger("yolo_server").setLevel(logging.CRITICAL)
+
+
+async def time_alerts(client: ESP32AlertClient, alerts: int, alert_type: str) -> dict:
+    samples, ok = [], 0
+    for i in range(alerts):
+        start = time.perf_counter()
+        ok += await client.send_alert("car", 1.0 + (i % 50) / 10, alert_type)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return {**summarize(samples), "delivered": ok}
+
+
+async def run_http(alerts: int) -> dict:
+    server = await start_audio_stub(0.0)
+    url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/alert"
+    client = ESP32AlertClient(url=url, transport="http")
+    await client.start()
+    try:
+        await time_alerts(client, 20, "presence")  # warm up keep-alive connection
+        return {
+            "presence": await time_alerts(client, alerts, "presence"),
+            "fall_alert": await time_alerts(client, alerts, "fall_alert"),
+        }
+    finally:
+        await client.stop()
+        server.close()
+
+
+async def run_udp(alerts: int, drop: float) -> dict:
+    transport, receiver = await start_receiver(drop_rate=drop, verbose=False)
+    settings.esp32_breaker_threshold = 10**9  # measure losses, don't trip
+    client = ESP32AlertClient(url="http://127.0.0.1/alert", transport="udp",
+                              udp_port=transport.get_extra_info("sockname")[1])
+    await client.start()
+    try:
+        report = {
+            "presence": await time_alerts(client, alerts, "presence"),
+            "fall_alert": await time_alerts(client, alerts, "fall_alert"),
+        }
+        report["udp_counts"] = dict(client.udp.counts)
+        report["receiver_dropped"] = receiver.dropped
+        return report
+    finally:
+        await client.stop()
+        transport.close()
+
+
+async def main_async(args):
+    settings.esp32_udp_ack_timeout = args.ack_timeout
+    report = {"http": await run_http(args.alerts)}
+    for drop in args.drop:
+        report[f"udp_drop_{drop}"] = await run_udp(args.alerts, drop)
+    print(json.dumps(report, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--alerts", type=int, default=2000)
+    parser.add_argument("--drop", type=float, nargs="+", default=[0.0, 0.1])
+    parser.add_argument("--ack-timeout", type=float, default=0.05)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""
+ObjectMemory per frame: one update() per box vs one update_many() call
+
+Replays frames with 10-300 tracked alert-class boxes. The objects drift
+closer so both "presence" and "approaching" alerts fire. Each frame's
+memory work is timed both ways. Both paths run on fresh memories and
+must produce the same alerts.
+
+Usage (from Laptop_server/):
+    python benchmarks/bench_update_many.py --boxes 10 50 300 --frames 500
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import bench_utils  # noqa: F401  (sets up sys.path)
+from bench_utils import summarize
+
+import numpy as np
+
+from server import ALERT_CLASSES, ObjectMemory
+
+
+def make_frames(boxes: int, frames: int, seed: int = 0) -> list:
+    """Per frame: [(track_id, distance, class_name), ...]"""
+    rng = np.random.default_rng(seed)
+    classes = sorted(ALERT_CLASSES)
+    names = [classes[i] for i in rng.integers(0, len(classes), boxes)]
+    distances = rng.uniform(2.0, 15.0, boxes)
+    out = []
+    for _ in range(frames):
+        distances = np.maximum(0.3, distances - rng.uniform(-0.05, 0.15, boxes))
+        out.append([(track_id, float(d), names[track_id]) for track_id, d in enumerate(distances)])
+    return out
+
+
+async def per_box(memory: ObjectMemory, rows: list) -> list:
+    """The loop process_frame ran before update_many"""
+    alerts = []
+    for track_id, distance, class_name in rows:
+        alert_type = await memory.update(track_id, distance)
+        if alert_type:
+            alerts.append((class_name, distance, alert_type))
+    return alerts
+
+
+async def run(path, frames: list) -> tuple:
+    memory = ObjectMemory()
+    samples, alerts = [], []
+    for rows in frames:
+        start = time.perf_counter()
+        alerts.append(await path(memory, rows))
+        samples.append((time.perf_counter() - start) * 1e6)
+    return summarize(samples), alerts
+
+
+async def main_async(args):
+    report = {}
+    for boxes in args.boxes:
+        frames = make_frames(boxes, args.frames)
+        old_stats, old_alerts = await run(per_box, frames)
+        new_stats, new_alerts = await run(lambda m, rows: m.update_many(rows), frames)
+        assert old_alerts == new_alerts, "alert decisions differ"
+
+        report[f"{boxes}_boxes"] = {
+            "alerts": sum(len(a) for a in new_alerts),
+            "per_box_mean_us": old_stats["mean_us"],
+            "update_many_mean_us": new_stats["mean_us"],
+            "per_box_p99_us": old_stats["p99_us"],
+            "update_many_p99_us": new_stats["p99_us"],
+            "speedup": round(old_stats["mean_us"] / new_stats["mean_us"], 2),
+        }
+    print(json.dumps(report, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--boxes", type=int, nargs="+", default=[10, 50, 300])
+    parser.add_argument("--frames", type=int, default=500)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
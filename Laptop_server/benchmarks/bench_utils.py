@@ -0,0 +1,143 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""Shared helpers for the benchmark scripts in this folder"""
+
+import asyncio
+import itertools
+import os
+import sys
+
+import numpy as np
+
+# Keep benchmark runs out of the server's log file (see setup_logging)
+os.environ.setdefault("LOG_FILE", "")
+
+# Benchmarks import pieces of server.py, which lives one level up
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+
+def percentile(samples, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples_us) -> dict:
+    """Mean / p50 / p99 of a list of microsecond samples"""
+    if not samples_us:
+        return {"n": 0, "mean_us": 0.0, "p50_us": 0.0, "p99_us": 0.0}
+    return {
+        "n": len(samples_us),
+        "mean_us": round(sum(samples_us) / len(samples_us), 1),
+        "p50_us": round(percentile(samples_us, 50), 1),
+        "p99_us": round(percentile(samples_us, 99), 1),
+    }
+
+
+def make_jpeg(width: int = 320, height: int = 240, quality: int = 80, seed: int = 0) -> bytes:
+    """Encode a synthetic frame roughly as busy as a real ESP32-CAM capture"""
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    img = np.zeros((height, width, 3), dtype=np.uint8)
+    # Smooth gradient plus blocks plus noise, so the JPEG isn't trivially small
+    img[..., 0] = np.linspace(0, 255, width, dtype=np.uint8)[None, :]
+    img[..., 1] = np.linspace(0, 255, height, dtype=np.uint8)[:, None]
+    for _ in range(12):
+        x, y = rng.integers(0, width - 20), rng.integers(0, height - 20)
+        w, h = rng.integers(10, width // 3), rng.integers(10, height // 3)
+        img[y:y + h, x:x + w] = rng.integers(0, 255, 3)
+    img = cv2.add(img, rng.integers(0, 30, img.shape, dtype=np.uint8))
+    ok, encoded = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise RuntimeError("JPEG encode failed")
+    return encoded.tobytes()
+
+
+async def start_audio_stub(delay: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+    """
+    Minimal HTTP stand-in for the ESP32 audio unit
+
+    Answers every request with 200 after `delay` seconds (never if delay < 0).
+    Returns the asyncio server; its port is server.sockets[0].getsockname()[1].
+    """
+    async def handle(reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":")[1])
+                await reader.readexactly(length)
+                if delay < 0:
+                    await asyncio.sleep(3600)
+                await asyncio.sleep(delay)
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+class FixedInference:
+    """
+    Stands in for InferenceWorker: a tracked result with `boxes` boxes
+
+    The boxes keep their track IDs from frame to frame, or get new ones
+    every frame with fresh_ids (so every frame raises "presence" alerts).
+    """
+
+    def __init__(self, names: dict, boxes: int, fresh_ids: bool = False):
+        self.model = type("Model", (), {"names": names})()
+        self.names = names
+        self.boxes = boxes
+        self._ids = itertools.count(boxes + 1) if fresh_ids else None
+        self._data = self._tracked(range(1, boxes + 1))
+
+    def _tracked(self, track_ids):
+        import torch
+
+        return torch.from_numpy(np.array([
+            [10 + 25 * i, 20, 40 + 25 * i, 200, track_id, 0.9, i % len(self.names)]
+            for i, track_id in enumerate(track_ids)
+        ], dtype=np.float32).reshape(-1, 7))
+
+    async def submit(self, device_id, img):
+        from ultralytics.engine.results import Results
+
+        data = self._data
+        if self._ids is not None:
+            data = self._tracked([next(self._ids) for _ in range(self.boxes)])
+        return Results(img, path="bench.jpg", names=self.names, boxes=data)
+
+    def get_stats(self) -> dict:
+        return {}
+
+
+def install_fixed_app(boxes: int, fresh_ids: bool = False) -> FixedInference:
+    """
+    Point server.app at a FixedInference, ready for /frame requests
+
+    Detection covers ALERT_CLASSES; alerts, the display and rate limiting
+    are off. Benchmarks switch back on what they measure.
+    """
+    from server import ALERT_CLASSES, RateLimiter, app
+
+    names = {i: name for i, name in enumerate(sorted(ALERT_CLASSES))}
+    inference = FixedInference(names, boxes, fresh_ids)
+    app.state.inference = inference
+    app.state.alert_class_ids = np.arange(len(names), dtype=np.int64)
+    app.state.distance_estimator.set_class_names(names)
+    app.state.alert_sinks.enabled = False
+    app.state.display_enabled = False
+    app.state.rate_limiter = RateLimiter(max_requests=10**9, window_seconds=60)
+    return inference
@@ -0,0 +1,305 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""
+Load generator: a fleet of simulated ESP32 units against a running server
+
+Each simulated unit behaves like its firmware:
+- ESP32-CAM (esp32_cam_sender.ino): POSTs a bare JPEG to /frame/raw
+  with X-Device-ID. Up to 3 attempts with a 5 s timeout each, waiting
+  100 ms * attempt between them. A fresh connection per request, like
+  HTTPClient begin()/end().
+- Fall unit (esp32_fall_detection.ino): POSTs
+  {"event": "fall_detected", "timestamp": <ms>} to /fall_alert. One
+  try, 3 s timeout.
+- Ultrasonic unit (ultrasono_newerer.ino): every 2 s, POSTs
+  {"sensor": "left|center|right", "distance": <cm>} to /obstacle_alert
+  for each sensor that sees something within 50 cm. One try, 1 s timeout.
+  The server has no /obstacle_alert route yet, so these come back 404.
+  They are reported like any other status.
+
+Frames are replayed from a directory of JPEGs, cycling through them,
+each camera starting at a different image. Without --images a synthetic
+320x240 frame is used. The report is JSON (stdout, and --output if
+given). It gives throughput, drop and failure rates and latency
+percentiles per unit type. It also gives the server's own time, from
+the Server-Timing header, so runs can be compared.
+
+Lots of 429s mean RATE_LIMIT_FRAMES/RATE_LIMIT_WINDOW allow less than
+--fps. Raise them, or give the loadgen devices an override with
+RATE_LIMIT_OVERRIDES.
+
+Usage (from Laptop_server/, with the server running):
+    python loadgen.py --cameras 4 --fps 5 --duration 60 --images ./frames
+    python loadgen.py --cameras 8 --fps 10 --fall-every 15 --ultrasonic 2 --output run.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import cv2
+import httpx
+import numpy as np
+
+# Firmware behaviour (esp32_cam_sender.ino / esp32_fall_detection.ino / ultrasono_newerer.ino)
+CAM_MAX_ATTEMPTS = 3
+CAM_TIMEOUT_S = 5.0
+CAM_BACKOFF_S = 0.1  # times the attempt number
+FALL_TIMEOUT_S = 3.0
+OBSTACLE_TIMEOUT_S = 1.0
+OBSTACLE_INTERVAL_S = 2.0
+OBSTACLE_RANGE_CM = 50
+SENSORS = ("left", "center", "right")
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def latency_summary(samples_ms: list) -> dict:
+    """p50 / p90 / p99 / max of a list of millisecond samples"""
+    return {
+        "n": len(samples_ms),
+        "p50_ms": round(percentile(samples_ms, 50), 2),
+        "p90_ms": round(percentile(samples_ms, 90), 2),
+        "p99_ms": round(percentile(samples_ms, 99), 2),
+        "max_ms": round(max(samples_ms), 2) if samples_ms else 0.0,
+    }
+
+
+def server_total_ms(response: httpx.Response) -> Optional[float]:
+    """The total;dur= entry of a Server-Timing header, if present"""
+    for entry in response.headers.get("server-timing", "").split(","):
+        name, _, params = entry.strip().partition(";")
+        if name == "total" and params.startswith("dur="):
+            try:
+                return float(params[4:])
+            except ValueError:
+                return None
+    return None
+
+
+def load_frames(directory: Optional[str]) -> List[bytes]:
+    """JPEG files from a directory, or one synthetic 320x240 frame"""
+    if directory:
+        paths = sorted(
+            p for p in Path(directory).iterdir()
+            if p.suffix.lower() in (".jpg", ".jpeg")
+        )
+        if not paths:
+            raise SystemExit(f"No .jpg/.jpeg files in {directory}")
+        return [p.read_bytes() for p in paths]
+
+    rng = np.random.default_rng(0)
+    img = cv2.GaussianBlur(rng.integers(0, 255, (240, 320, 3), dtype=np.uint8), (7, 7), 0)
+    ok, jpeg = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 80])
+    return [jpeg.tobytes()]
+
+
+class UnitStats:
+    """Outcome counters and latency samples for one kind of unit"""
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.status: Dict[str, int] = {}
+        self.latency_ms: list = []
+        self.server_ms: list = []
+
+    def count(self, key: str, n: int = 1):
+        self.counts[key] = self.counts.get(key, 0) + n
+
+    def record(self, response: Optional[httpx.Response], error: Optional[str] = None):
+        key = str(response.status_code) if response is not None else error
+        self.status[key] = self.status.get(key, 0) + 1
+        if response is not None:
+            server_ms = server_total_ms(response)
+            if server_ms is not None:
+                self.server_ms.append(server_ms)
+
+    def report(self) -> dict:
+        report = {
+            **self.counts,
+            "status": dict(sorted(self.status.items())),
+            "latency": latency_summary(self.latency_ms),
+        }
+        if self.server_ms:
+            report["server_time"] = latency_summary(self.server_ms)
+        return report
+
+
+async def sleep_until(deadline: float, seconds: float):
+    """Sleep for seconds, but not past the end of the run"""
+    await asyncio.sleep(max(0.0, min(seconds, deadline - time.monotonic())))
+
+
+async def post(client: httpx.AsyncClient, stats: UnitStats, path: str,
+               timeout: float, **kwargs) -> Optional[httpx.Response]:
+    """One HTTP attempt; connection errors and timeouts are recorded, not raised"""
+    try:
+        response = await client.post(path, timeout=timeout, **kwargs)
+    except httpx.TimeoutException:
+        stats.record(None, "timeout")
+        return None
+    except httpx.TransportError as e:
+        stats.record(None, type(e).__name__)
+        return None
+    stats.record(response)
+    return response
+
+
+async def camera(client: httpx.AsyncClient, stats: UnitStats, device_id: str,
+                 frames: List[bytes], offset: int, fps: float, until: float):
+    """esp32_cam_sender.ino's capture/send loop"""
+    headers = {"Content-Type": "image/jpeg", "X-Device-ID": device_id}
+    next_at = time.monotonic()
+    index = offset
+    while next_at < until:
+        frame = frames[index % len(frames)]
+        index += 1
+        stats.count("frames")
+        for attempt in range(1, CAM_MAX_ATTEMPTS + 1):
+            attempt_started = time.perf_counter()
+            response = await post(client, stats, "/frame/raw", CAM_TIMEOUT_S,
+                                  content=frame, headers=headers)
+            if response is not None and response.status_code == 200:
+                stats.latency_ms.append((time.perf_counter() - attempt_started) * 1000)
+                stats.count("sent")
+                if attempt > 1:
+                    stats.count("sent_after_retry")
+                try:
+                    if response.json().get("dropped"):
+                        stats.count("dropped_by_server")
+                except ValueError:
+                    pass
+                break
+            if attempt < CAM_MAX_ATTEMPTS:
+                stats.count("retries")
+                await asyncio.sleep(CAM_BACKOFF_S * attempt)
+        else:
+            stats.count("failed")
+
+        # Next capture on the fps schedule; a camera that fell behind just goes again
+        next_at = max(next_at + 1 / fps, time.monotonic())
+        await asyncio.sleep(next_at - time.monotonic())
+
+
+async def fall_unit(client: httpx.AsyncClient, stats: UnitStats, every_s: float,
+                    until: float, boot: float):
+    """A fall every every_s seconds (esp32_fall_detection.ino sendFallAlertToLaptop)"""
+    await sleep_until(until, every_s / 2)
+    while time.monotonic() < until:
+        stats.count("sent")
+        payload = {"event": "fall_detected", "timestamp": int((time.monotonic() - boot) * 1000)}
+        started = time.perf_counter()
+        response = await post(client, stats, "/fall_alert", FALL_TIMEOUT_S, json=payload)
+        if response is not None:
+            stats.latency_ms.append((time.perf_counter() - started) * 1000)
+        await sleep_until(until, every_s)
+
+
+async def ultrasonic_unit(client: httpx.AsyncClient, stats: UnitStats, rng: random.Random,
+                          until: float):
+    """ultrasono_newerer.ino's 2 s alert loop with random readings"""
+    while time.monotonic() < until:
+        for sensor in SENSORS:
+            distance = rng.randint(5, 2 * OBSTACLE_RANGE_CM)
+            if distance > OBSTACLE_RANGE_CM:
+                continue
+            stats.count("sent")
+            started = time.perf_counter()
+            response = await post(client, stats, "/obstacle_alert", OBSTACLE_TIMEOUT_S,
+                                  json={"sensor": sensor, "distance": distance})
+            if response is not None:
+                stats.latency_ms.append((time.perf_counter() - started) * 1000)
+        await sleep_until(until, OBSTACLE_INTERVAL_S)
+
+
+async def run(args) -> dict:
+    frames = load_frames(args.images)
+    # HTTPClient opens a new connection for every request unless --keepalive
+    limits = httpx.Limits(max_keepalive_connections=None if args.keepalive else 0)
+    cams, falls, obstacles = UnitStats(), UnitStats(), UnitStats()
+    rng = random.Random(args.seed)
+
+    async with httpx.AsyncClient(base_url=args.url, limits=limits) as client:
+        boot = time.monotonic()
+        until = boot + args.duration
+        tasks = [
+            camera(client, cams, f"{args.device_prefix}-{i:02d}", frames, i, args.fps, until)
+            for i in range(args.cameras)
+        ]
+        if args.fall_every > 0:
+            tasks.append(fall_unit(client, falls, args.fall_every, until, boot))
+        tasks += [ultrasonic_unit(client, obstacles, rng, until) for _ in range(args.ultrasonic)]
+
+        started = time.perf_counter()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    sent = cams.counts.get("sent", 0)
+    report = {
+        "config": {
+            "url": args.url,
+            "cameras": args.cameras,
+            "fps": args.fps,
+            "duration_s": args.duration,
+            "images": len(frames),
+            "frame_bytes": round(sum(map(len, frames)) / len(frames)),
+            "keepalive": args.keepalive,
+            "fall_every_s": args.fall_every,
+            "ultrasonic_units": args.ultrasonic,
+        },
+        "elapsed_s": round(elapsed, 2),
+        "cameras": {
+            **cams.report(),
+            "throughput_fps": round(sent / elapsed, 2),
+            "target_fps": args.cameras * args.fps,
+            "drop_rate": round(cams.counts.get("dropped_by_server", 0) / sent, 4) if sent else 0.0,
+            "failure_rate": round(cams.counts.get("failed", 0) / cams.counts["frames"], 4)
+                            if cams.counts.get("frames") else 0.0,
+        },
+    }
+    if args.fall_every > 0:
+        report["fall"] = falls.report()
+    if args.ultrasonic:
+        report["ultrasonic"] = obstacles.report()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated ESP32 fleet load generator")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="server base URL")
+    parser.add_argument("--images", default=None, help="directory of .jpg frames to replay")
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--fps", type=float, default=5.0, help="frames per second per camera")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--fall-every", type=float, default=0.0,
+                        help="seconds between fall alerts (0 = no fall unit)")
+    parser.add_argument("--ultrasonic", type=int, default=0, help="number of ultrasonic units")
+    parser.add_argument("--keepalive", action="store_true",
+                        help="reuse connections (the firmware does not)")
+    parser.add_argument("--device-prefix", default="loadgen")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="also write the JSON report here")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""
+INT8 post-training quantization for the CPU detection model
+
+Takes YOLO_MODEL_PATH, exports it to ONNX (reusing the server's export
+cache), and quantizes it with ONNX Runtime static quantization. Real
+ESP32-CAM frames are used for calibration. The INT8 model lands where
+INFERENCE_BACKEND=onnx-int8 looks for it.
+
+It then runs FP32 and INT8 on held-out frames and reports the speedup and
+the INT8 recall for every ALERT_CLASSES class. There is no ground truth,
+so FP32 detections are the reference: recall here means "what fraction of
+the FP32 model's alert-class detections does INT8 still find".
+
+Usage (from Laptop_server/):
+    python quantize_model.py --frames recorded_frames/ --calibration 200
+
+Needs: pip install onnx onnxruntime
+"""
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+import onnx
+from onnxruntime import InferenceSession
+from onnxruntime.quantization import (
+    CalibrationDataReader,
+    CalibrationMethod,
+    QuantFormat,
+    QuantType,
+    quantize_static,
+)
+from ultralytics import YOLO
+from ultralytics.data.augment import LetterBox
+from ultralytics.utils.downloads import attempt_download_asset
+
+from server import ALERT_CLASSES, export_model, quantized_model_path, settings
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+
+
+def load_frames(folder: str) -> list:
+    paths = sorted(p for p in Path(folder).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    if not paths:
+        raise SystemExit(f"No frames found in {folder}")
+    return paths
+
+
+def preprocess(path: Path, imgsz: int) -> np.ndarray:
+    """Same letterbox + normalisation the ultralytics predictor applies"""
+    img = cv2.imread(str(path), cv2.IMREAD_COLOR)
+    img = LetterBox((imgsz, imgsz), auto=False)(image=img)
+    img = img[..., ::-1].transpose(2, 0, 1)  # BGR HWC -> RGB CHW
+    return np.ascontiguousarray(img, dtype=np.float32)[None] / 255.0
+
+
+class FrameCalibrationReader(CalibrationDataReader):
+    """Feeds recorded frames to the calibrator one at a time"""
+
+    def __init__(self, paths: list, input_name: str, imgsz: int):
+        self._paths = iter(paths)
+        self._input_name = input_name
+        self._imgsz = imgsz
+
+    def get_next(self):
+        path = next(self._paths, None)
+        if path is None:
+            return None
+        return {self._input_name: preprocess(path, self._imgsz)}
+
+
+def head_node_names(model: onnx.ModelProto) -> list:
+    """Nodes of the final Detect module (box decoding is precision sensitive)"""
+    indices = set()
+    for node in model.graph.node:
+        parts = node.name.split("/")
+        if len(parts) > 1 and parts[1].startswith("model."):
+            suffix = parts[1][len("model."):]
+            if suffix.isdigit():
+                indices.add(int(suffix))
+    if not indices:
+        return []
+    prefix = f"/model.{max(indices)}/"
+    return [node.name for node in model.graph.node if node.name.startswith(prefix)]
+
+
+def quantize(fp32_path: str, int8_path: Path, calib_paths: list, imgsz: int,
+             exclude_head: bool) -> None:
+    input_name = InferenceSession(fp32_path, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+    fp32_model = onnx.load(fp32_path)
+
+    quantize_static(
+        fp32_path,
+        str(int8_path),
+        FrameCalibrationReader(calib_paths, input_name, imgsz),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        calibrate_method=CalibrationMethod.MinMax,
+        nodes_to_exclude=head_node_names(fp32_model) if exclude_head else [],
+    )
+
+    # Keep the ultralytics metadata (class names, stride, imgsz) so the INT8
+    # model loads through YOLO() exactly like the FP32 export
+    int8_model = onnx.load(str(int8_path))
+    del int8_model.metadata_props[:]
+    int8_model.metadata_props.extend(fp32_model.metadata_props)
+    onnx.save(int8_model, str(int8_path))
+
+
+def alert_detections(result, names: dict) -> list:
+    """(class_name, xyxy) for alert-class boxes above the server's threshold"""
+    boxes = result.boxes
+    keep = []
+    for cls, conf, xyxy in zip(boxes.cls.tolist(), boxes.conf.tolist(), boxes.xyxy.tolist()):
+        name = names[int(cls)]
+        if name in ALERT_CLASSES and conf >= settings.confidence_threshold:
+            keep.append((name, xyxy))
+    return keep
+
+
+def iou(a, b) -> float:
+    ix1, iy1, ix2, iy2 = max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, ix2 - ix1) * max(0.0, iy2 - iy1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def evaluate(fp32_path: str, int8_path: Path, eval_paths: list, imgsz: int,
+             iou_threshold: float) -> dict:
+    fp32 = YOLO(fp32_path, task="detect")
+    int8 = YOLO(str(int8_path), task="detect")
+    names = fp32.names
+
+    timings = {"fp32": 0.0, "int8": 0.0}
+    per_class = {name: {"reference": 0, "found": 0} for name in sorted(ALERT_CLASSES)}
+
+    for model in (fp32, int8):  # warm up both sessions
+        model.predict(str(eval_paths[0]), imgsz=imgsz, verbose=False)
+
+    for path in eval_paths:
+        img = cv2.imread(str(path), cv2.IMREAD_COLOR)
+
+        start = time.perf_counter()
+        ref = alert_detections(fp32.predict(img, imgsz=imgsz, verbose=False)[0], names)
+        timings["fp32"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        cand = alert_detections(int8.predict(img, imgsz=imgsz, verbose=False)[0], names)
+        timings["int8"] += time.perf_counter() - start
+
+        # Greedy one-to-one matching per class
+        unmatched = list(cand)
+        for name, box in ref:
+            per_class[name]["reference"] += 1
+            best = max(
+                (c for c in unmatched if c[0] == name),
+                key=lambda c: iou(box, c[1]),
+                default=None,
+            )
+            if best is not None and iou(box, best[1]) >= iou_threshold:
+                per_class[name]["found"] += 1
+                unmatched.remove(best)
+
+    reference = sum(c["reference"] for c in per_class.values())
+    found = sum(c["found"] for c in per_class.values())
+    return {
+        "eval_frames": len(eval_paths),
+        "fp32_ms_per_frame": round(timings["fp32"] / len(eval_paths) * 1000, 2),
+        "int8_ms_per_frame": round(timings["int8"] / len(eval_paths) * 1000, 2),
+        "speedup": round(timings["fp32"] / timings["int8"], 2) if timings["int8"] else None,
+        "alert_recall_vs_fp32": round(found / reference, 4) if reference else None,
+        "per_class": {
+            name: {**c, "recall": round(c["found"] / c["reference"], 4) if c["reference"] else None}
+            for name, c in per_class.items() if c["reference"]
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="INT8 quantization for the detection model")
+    parser.add_argument("--frames", required=True, help="folder of recorded ESP32-CAM frames")
+    parser.add_argument("--model", default=settings.yolo_model_path)
+    parser.add_argument("--imgsz", type=int, default=settings.model_input_size)
+    parser.add_argument("--calibration", type=int, default=200,
+                        help="frames used for calibration (the rest are used for evaluation)")
+    parser.add_argument("--max-eval", type=int, default=300)
+    parser.add_argument("--iou", type=float, default=0.5)
+    parser.add_argument("--quantize-head", action="store_true",
+                        help="also quantize the Detect head (faster, usually less accurate)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = load_frames(args.frames)
+    random.Random(args.seed).shuffle(paths)
+    calib_paths = paths[:args.calibration]
+    eval_paths = paths[args.calibration:][:args.max_eval] or calib_paths
+
+    model_path = attempt_download_asset(args.model)
+    fp32_path = export_model(model_path, "onnx", args.imgsz)
+    int8_path = quantized_model_path(model_path, args.imgsz)
+
+    print(f"Calibrating on {len(calib_paths)} frames -> {int8_path}")
+    quantize(fp32_path, int8_path, calib_paths, args.imgsz, exclude_head=not args.quantize_head)
+
+    report = {
+        "model": args.model,
+        "imgsz": args.imgsz,
+        "int8_model": str(int8_path),
+        "calibration_frames": len(calib_paths),
+        **evaluate(fp32_path, int8_path, eval_paths, args.imgsz, args.iou),
+    }
+    int8_path.with_suffix(".json").write_text(json.dumps(report, indent=2))
+    print(json.dumps(report, indent=2))
+    print("\nTo use it: INFERENCE_BACKEND=onnx-int8")
+
+
+if __name__ == "__main__":
+    main()
@@ -126,36 +126,197 @@
 
 
 from fastapi import FastAPI, File, UploadFile, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi import HTTPException
 import uvicorn
 from ultralytics import YOLO
-from PIL import Image
-from io import BytesIO
+from ultralytics.trackers.track import TRACKER_MAP
+from ultralytics.utils import IterableSimpleNamespace
+try:
+    from ultralytics.utils import YAML  # ultralytics >= 8.3
+    load_yaml = YAML.load
+except ImportError:
+    from ultralytics.utils import yaml_load as load_yaml
+from ultralytics.utils.checks import check_yaml
+from ultralytics.utils.downloads import attempt_download_asset
+import torch
 import httpx
 import time
 import cv2
 import numpy as np
 from pydantic_settings import BaseSettings
 from pydantic import Field
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional
 import asyncio
 from contextlib import asynccontextmanager
-from collections import defaultdict  
-from datetime import datetime, timedelta 
+from collections import OrderedDict, defaultdict, deque
+import threading
+import sys
+import hashlib
+import struct
+import inspect
+import itertools
+from functools import lru_cache
+from bisect import bisect_left
+import shutil
+from pathlib import Path
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import queue
+import atexit
+
+try:
+    from turbojpeg import TurboJPEG  # optional: pip install PyTurboJPEG
+except ImportError:
+    TurboJPEG = None
 
 # ═══════════════════════════════════════════════════════════════
 #  LOGGING CONFIGURATION (Claude's sugeestion)
 # ═══════════════════════════════════════════════════════════════
 
+LOG_QUEUE_SIZE = 10_000  # records waiting for the writer thread; more are dropped
+LOG_DUPLICATE_WINDOW = 10.0  # identical warnings/errors within this many s are counted, not written
+LOG_FLUSH_INTERVAL = 1.0  # how often the listener side writes out finished duplicate counts
+
+class DuplicateFilter(logging.Filter):
+    """
+    Collapse repeated identical warnings and errors
+
+    The first occurrence of a message is written. Repeats within
+    `window` seconds are only counted; once the window is over, flush()
+    turns the count into a "(+N identical ...)" record (or the next
+    occurrence carries it). CRITICAL records (the fall banner) always
+    pass. Runs in whichever thread logs, hence the lock.
+    """
+
+    MAX_KEYS = 256
+
+    def __init__(self, window: float = LOG_DUPLICATE_WINDOW):
+        super().__init__()
+        self.window = window
+        self.suppressed = 0
+        self._seen: OrderedDict = OrderedDict()  # (level, message) -> [window start, repeats, logger]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.window <= 0 or not logging.WARNING <= record.levelno < logging.CRITICAL:
+            return True
+        message = record.getMessage()
+        key = (record.levelno, message)
+        now = time.monotonic()
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is not None and now - seen[0] < self.window:
+                seen[1] += 1
+                self.suppressed += 1
+                return False
+            self._seen[key] = [now, 0, record.name]
+            self._seen.move_to_end(key)
+            if len(self._seen) > self.MAX_KEYS:
+                self._seen.popitem(last=False)
+        if seen is not None and seen[1]:
+            record.msg = f"{message} (+{seen[1]} identical in {now - seen[0]:.1f}s)"
+            record.args = None
+        return True
+
+    def flush(self, final: bool = False) -> list:
+        """
+        Summary records for suppressed repeats whose window is over
+
+        With final=True (shutdown), every pending count is flushed.
+        """
+        now = time.monotonic()
+        records = []
+        with self._lock:
+            for key, (start, repeats, name) in list(self._seen.items()):
+                if not repeats or (not final and now - start < self.window):
+                    continue
+                del self._seen[key]
+                level, message = key
+                records.append(logging.LogRecord(
+                    name, level, __file__, 0,
+                    f"{message} (+{repeats} identical in {now - start:.1f}s)", None, None
+                ))
+        return records
+
+class LogQueueHandler(QueueHandler):
+    """
+    Hand records to the QueueListener thread without ever blocking
+
+    A full queue (disk stalled for a long time) drops the record and
+    counts it rather than stalling the event loop.
+    """
+
+    def __init__(self, maxsize: int = LOG_QUEUE_SIZE):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+        self.duplicates = DuplicateFilter()
+        self.addFilter(self.duplicates)
+        self.listener: Optional[QueueListener] = None
+        self._flusher: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def start(self, *handlers: logging.Handler):
+        """Run handlers on a listener thread (flushed at interpreter exit)"""
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+        self._stopping.clear()
+        self._flusher = threading.Thread(target=self._flush_loop, name="log-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.stop)
+
+    def _flush_loop(self):
+        """Write out duplicate counts even if the message never comes back"""
+        while not self._stopping.wait(LOG_FLUSH_INTERVAL):
+            self._flush_duplicates()
+
+    def _flush_duplicates(self, final: bool = False):
+        for record in self.duplicates.flush(final):
+            self.enqueue(self.prepare(record))
+
+    def stop(self):
+        if self._flusher is not None:
+            self._stopping.set()
+            self._flusher.join()
+            self._flusher = None
+        if self.listener is not None:
+            self._flush_duplicates(final=True)
+            self.listener.stop()  # writes out whatever is still queued
+            self.listener = None
+
+    def get_stats(self) -> dict:
+        return {
+            "queued": self.queue.qsize(),
+            "dropped": self.dropped,
+            "duplicates_suppressed": self.duplicates.suppressed,
+            "duplicate_window_s": self.duplicates.window
+        }
+
+DEFAULT_LOG_FILE = "logs/yolo_server.log"
+
 def setup_logging():
-    """Configure application logging"""
-    # Create logs directory if it doesn't exist
+    """
+    Configure application logging
+
+    Console and file output (including rotation) happen on a
+    QueueListener thread; logging calls only enqueue the record.
+    The file is LOG_FILE from the environment (default
+    logs/yolo_server.log, empty for console only): this runs before
+    Settings is loaded.
+
+    Returns:
+        (logger, LogQueueHandler)
+    """
     import os
-    os.makedirs("logs", exist_ok=True)
+    log_file = os.environ.get("LOG_FILE", DEFAULT_LOG_FILE)
     
+
     # Configure root logger
     logger = logging.getLogger("yolo_server")
     logger.setLevel(logging.INFO)
@@ -169,26 +330,33 @@ def setup_logging():
     )
     console_handler.setFormatter(console_formatter)
     
+    handlers = [console_handler]
+    
     # File handler (rotating, 10MB max, keep 3 backups)
-    file_handler = RotatingFileHandler(
-        "logs/yolo_server.log",
-        maxBytes=10_000_000,
-        backupCount=3
-    )
-    file_handler.setLevel(logging.DEBUG)
-    file_formatter = logging.Formatter(
-        '%(asctime)s | %(levelname)-8s | %(name)s | %(message)s'
-    )
-    file_handler.setFormatter(file_formatter)
+    if log_file:
+        # Create the log directory if it doesn't exist
+        os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+        file_handler = RotatingFileHandler(
+            log_file,
+            maxBytes=10_000_000,
+            backupCount=3
+        )
+        file_handler.setLevel(logging.DEBUG)
+        file_formatter = logging.Formatter(
+            '%(asctime)s | %(levelname)-8s | %(name)s | %(message)s'
+        )
+        file_handler.setFormatter(file_formatter)
+        handlers.append(file_handler)
     
-    # Add handlers
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    # Add handlers (behind the queue)
+    log_queue = LogQueueHandler()
+    log_queue.start(*handlers)
+    logger.addHandler(log_queue)
     
-    return logger
+    return logger, log_queue
 
 # Initialize logger
-logger = setup_logging()
+logger, log_queue = setup_logging()
 
 #--------------------------------------------------------------------------------------------------------------------------
 
@@ -201,9 +369,47 @@ class Settings(BaseSettings):
     yolo_model_path: str = Field(default="yolo11m.pt", env="YOLO_MODEL_PATH")
     confidence_threshold: float = Field(default=0.5, env="CONFIDENCE_THRESHOLD")
     
+    # Hand class IDs (ALERT_CLASSES + display_classes) and the confidence
+    # threshold to the predictor, so NMS and post-processing skip the rest
+    filter_in_model: bool = Field(default=False, env="FILTER_IN_MODEL")
+    display_classes: List[str] = Field(default=[], env="DISPLAY_CLASSES")
+    model_input_size: int = Field(default=640, env="MODEL_INPUT_SIZE")
+    
+    # Inference runtime: torch, onnx, openvino or onnx-int8 (see quantize_model.py)
+    inference_backend: str = Field(default="torch", env="INFERENCE_BACKEND")
+    export_cache_dir: str = Field(default="model_cache", env="EXPORT_CACHE_DIR")
+    
+    # Inference threads (each loads its own copy of the model)
+    inference_workers: int = Field(default=1, env="INFERENCE_WORKERS")
+    
+    # Cross-camera micro-batching: wait this long for other cameras' frames
+    batch_window_ms: float = Field(default=15.0, env="BATCH_WINDOW_MS")
+    batch_max_frames: int = Field(default=8, env="BATCH_MAX_FRAMES")
+    
+    # Tracker config (same default as model.track), one tracker per camera
+    tracker_config: str = Field(default="botsort.yaml", env="TRACKER_CONFIG")
+    
+    # Device identity (header, falls back to client IP) and idle eviction
+    device_id_header: str = Field(default="X-Device-ID", env="DEVICE_ID_HEADER")
+    device_idle_timeout: int = Field(default=120, env="DEVICE_IDLE_TIMEOUT")  # seconds
+    
+    # Decode large JPEGs at 1/2, 1/4 or 1/8 scale (libjpeg scaled DCT)
+    scaled_decode: bool = Field(default=True, env="SCALED_DECODE")
+    
     # ESP32 configs
     esp32_audio_url: str = Field(default="http://192.168.1.100/alert", env="ESP32_AUDIO_URL")
     esp32_timeout: float = Field(default=0.5, env="ESP32_TIMEOUT")
+    esp32_transport: str = Field(default="http", env="ESP32_TRANSPORT")  # http or udp
+    esp32_udp_port: int = Field(default=5005, env="ESP32_UDP_PORT")
+    esp32_udp_ack_timeout: float = Field(default=0.15, env="ESP32_UDP_ACK_TIMEOUT")
+    esp32_udp_retries: int = Field(default=3, env="ESP32_UDP_RETRIES")
+    # Several alert units: JSON list of {"name", "url", "classes", "transport",
+    # "udp_port"}; empty means the single ESP32_AUDIO_URL unit
+    alert_sinks: List[dict] = Field(default=[], env="ALERT_SINKS")
+    esp32_breaker_threshold: int = Field(default=3, env="ESP32_BREAKER_THRESHOLD")
+    esp32_probe_interval: float = Field(default=2.0, env="ESP32_PROBE_INTERVAL")
+    alert_queue_size: int = Field(default=32, env="ALERT_QUEUE_SIZE")
+    alert_playback_s: float = Field(default=1.5, env="ALERT_PLAYBACK_S")
     
     # Alert Settings
     danger_distance_m: float = Field(default=2.0, env="DANGER_DISTANCE_M")
@@ -230,12 +436,26 @@ class Settings(BaseSettings):
     "banana": 0.1
 }
     
+    # Per-device frame rate limit (token bucket): LIMIT frames per WINDOW
+    # seconds, with per-device overrides as JSON {"device-id": limit}
+    rate_limit_frames: int = Field(default=30, env="RATE_LIMIT_FRAMES")
+    rate_limit_window: float = Field(default=60.0, env="RATE_LIMIT_WINDOW")
+    rate_limit_overrides: Dict[str, int] = Field(default={}, env="RATE_LIMIT_OVERRIDES")
+    
     # Memory cleanup
     memory_cleanup_interval: int = Field(default=60, env="MEMORY_CLEANUP_INTERVAL")  # seconds
     memory_max_age: int = Field(default=30, env="MEMORY_MAX_AGE")  # seconds
     
     # Display Settings
     display_enabled: bool = Field(default=True, env="DISPLAY_ENABLED")
+    display_max_fps: float = Field(default=15.0, env="DISPLAY_MAX_FPS")
+    
+    # MJPEG preview at GET /preview (encodes only while someone watches)
+    preview_max_fps: float = Field(default=10.0, env="PREVIEW_MAX_FPS")
+    preview_jpeg_quality: int = Field(default=70, env="PREVIEW_JPEG_QUALITY")
+    
+    # Recent per-frame stage timings kept for GET /traces (0 disables)
+    frame_trace_size: int = Field(default=512, env="FRAME_TRACE_SIZE")
     
     class Config:
         env_file = ".env"
@@ -246,13 +466,28 @@ settings = Settings()
 
 #Rate limiter
 class RateLimiter:
-    """Simple in-memory rate limiter"""
+    """
+    Token-bucket rate limiter on the monotonic clock
+
+    Every client has a bucket of `limit` frames that refills at
+    limit/window per second, so each check is O(1) in time and memory.
+    Clients are kept in last-seen order. A client idle for a whole window
+    has a full bucket again and is no different from a new one, so idle
+    clients are popped from the front during checks, with no cleanup task.
+    """
     
-    def __init__(self, max_requests: int, window_seconds: int):
+    def __init__(self, max_requests: int, window_seconds: float,
+                 overrides: Optional[Dict[str, int]] = None):
         self.max_requests = max_requests
-        self.window = timedelta(seconds=window_seconds)
-        self.requests: Dict[str, list] = defaultdict(list)
-        self._lock = asyncio.Lock()
+        self.window = float(window_seconds)
+        self.overrides = overrides or {}
+        # client_id -> [tokens, last refill time, capacity]
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self.rejected = 0
+    
+    def limit_for(self, client_id: str) -> int:
+        """Frames per window allowed for this client"""
+        return self.overrides.get(client_id, self.max_requests)
     
     async def check_rate_limit(self, client_id: str) -> bool:
         """
@@ -261,103 +496,166 @@ class RateLimiter:
         Returns:
             True if allowed, False if rate limited
         """
-        async with self._lock:
-            now = datetime.now()
-            
-            # Remove old requests outside the window
-            self.requests[client_id] = [
-                req_time for req_time in self.requests[client_id]
-                if now - req_time < self.window
-            ]
-            
-            # Check if under limit
-            if len(self.requests[client_id]) >= self.max_requests:
-                return False
-            
-            # Record this request
-            self.requests[client_id].append(now)
-            return True
+        # No await in here, so the check is atomic on the event loop
+        now = time.monotonic()
+        self._evict_idle(now)
+        
+        bucket = self._buckets.get(client_id)
+        if bucket is None:
+            capacity = self.limit_for(client_id)
+            bucket = self._buckets[client_id] = [float(capacity), now, capacity]
+        else:
+            self._buckets.move_to_end(client_id)
+            tokens, last, capacity = bucket
+            bucket[0] = min(capacity, tokens + (now - last) * capacity / self.window)
+            bucket[1] = now
+        
+        if bucket[0] < 1.0:
+            self.rejected += 1
+            return False
+        
+        bucket[0] -= 1.0
+        return True
     
-    async def cleanup_old_clients(self):
-        """Remove clients with no recent requests"""
-        async with self._lock:
-            now = datetime.now()
-            stale_clients = [
-                client_id for client_id, requests in self.requests.items()
-                if not requests or now - requests[-1] > self.window * 2
-            ]
-            for client_id in stale_clients:
-                del self.requests[client_id]
+    def _evict_idle(self, now: float):
+        """Drop clients whose bucket has refilled completely (oldest first)"""
+        while self._buckets:
+            client_id, bucket = next(iter(self._buckets.items()))
+            if now - bucket[1] < self.window:
+                break
+            del self._buckets[client_id]
+    
+    def get_stats(self) -> dict:
+        """Get rate limiter statistics"""
+        return {
+            "clients": len(self._buckets),
+            "rejected": self.rejected,
+            "limit_per_window": self.max_requests,
+            "window_s": self.window
+        }
 
 #  APPLICATION STATE MANAGEMENT
 
+class TrackRecord:
+    """Per-track state (slots instead of a per-track dict)"""
+
+    __slots__ = ("last_distance", "last_alert_time", "last_seen", "first_seen")
+
+    def __init__(self, distance: float, now: float):
+        self.last_distance = distance
+        self.last_alert_time = 0.0
+        self.last_seen = now
+        self.first_seen = now
+
+# Bytes one track costs on top of the table: the record, the int key and
+# two floats (distance, plus one timestamp object shared by last/first seen)
+TRACK_RECORD_BYTES = (
+    sys.getsizeof(TrackRecord(0.0, 0.0))
+    + 2 * sys.getsizeof(0.0)
+    + sys.getsizeof(1 << 20)
+)
+
 class ObjectMemory:
-    """Thread-safe object memory with automatic cleanup"""
+    """
+    Thread-safe object memory with automatic cleanup
+
+    Tracks live in an OrderedDict kept in last-seen order: every update
+    moves the track to the back. The least recently seen track is always at
+    the front, so LRU eviction and stale-track expiry only ever pop from
+    the front and never scan the whole table.
+    """
+
+    MAX_TRACKS = 1000
     
     def __init__(self):
-        self._memory: Dict[int, dict] = {}
+        self._memory: "OrderedDict[int, TrackRecord]" = OrderedDict()
         self._lock = asyncio.Lock()
+        self.evictions = 0  # tracks dropped because MAX_TRACKS was reached
+        self._evictions_reported = 0
     
     async def update(self, track_id: int, distance: float) -> Optional[str]:
         """Update object memory and return alert type if needed"""
+        async with self._lock:
+            return self._update_locked(track_id, distance, time.time())
+    
+    async def update_many(self, rows: list) -> list:
+        """
+        Apply a whole frame's (track_id, distance, class_name) rows at once
+
+        Takes the lock once for the frame instead of once per box.
+
+        Returns:
+            (class_name, distance, alert_type) for every row that needs an alert
+        """
+        alerts = []
         async with self._lock:
             now = time.time()
-            
-            if track_id not in self._memory:
-
-                if len(self._memory) >= 1000:
-                    oldest_id = min(self._memory.items(), key=lambda x: x[1]['last_seen'])[0]
-                    del self._memory[oldest_id]
-                    logger.warning(f"Memory full, evicted track {oldest_id}")
-                self._memory[track_id] = {
-                    "seen": True,
-                    "last_distance": distance,
-                    "last_alert_time": 0,
-                    "last_seen": now,
-                    "first_seen": now
-                }
-                return "presence"  # Alert once on first sight
-            
-            obj = self._memory[track_id]
-            prev_distance = obj["last_distance"]
-            last_alert = obj["last_alert_time"]
-            
-            # Update tracking info
-            obj["last_distance"] = distance
-            obj["last_seen"] = now
-            
-            # Standing still or moving away
-            if distance >= prev_distance:
-                return None
-            
-            # Approaching and within danger zone
-            if distance <= settings.danger_distance_m:
-                if now - last_alert >= settings.alert_cooldown:
-                    obj["last_alert_time"] = now
-                    return "approaching"
-            
+            for track_id, distance, class_name in rows:
+                alert_type = self._update_locked(track_id, distance, now)
+                if alert_type:
+                    alerts.append((class_name, distance, alert_type))
+        return alerts
+    
+    def _update_locked(self, track_id: int, distance: float, now: float) -> Optional[str]:
+        """Update one track; the caller holds the lock"""
+        obj = self._memory.get(track_id)
+        if obj is None:
+
+            if len(self._memory) >= self.MAX_TRACKS:
+                oldest_id, _ = self._memory.popitem(last=False)
+                self.evictions += 1
+                logger.debug(f"Memory full, evicted track {oldest_id}")
+            self._memory[track_id] = TrackRecord(distance, now)
+            return "presence"  # Alert once on first sight
+        
+        self._memory.move_to_end(track_id)
+        prev_distance = obj.last_distance
+        
+        # Update tracking info
+        obj.last_distance = distance
+        obj.last_seen = now
+        
+        # Standing still or moving away
+        if distance >= prev_distance:
             return None
+        
+        # Approaching and within danger zone
+        if distance <= settings.danger_distance_m:
+            if now - obj.last_alert_time >= settings.alert_cooldown:
+                obj.last_alert_time = now
+                return "approaching"
+        
+        return None
     
     async def cleanup_stale_tracks(self):
-        """Remove tracks not seen recently"""
+        """Remove tracks not seen recently (oldest first, stops at the first fresh one)"""
         async with self._lock:
-            now = time.time()
-            stale_ids = [
-                track_id for track_id, obj in self._memory.items()
-                if now - obj["last_seen"] > settings.memory_max_age
-            ]
-            for track_id in stale_ids:
-                del self._memory[track_id]
+            cutoff = time.time() - settings.memory_max_age
+            removed = 0
+            for track_id, obj in self._memory.items():
+                if obj.last_seen >= cutoff:
+                    break
+                removed += 1
+            for _ in range(removed):
+                self._memory.popitem(last=False)
             
-            if stale_ids:
-                logger.info(f"Cleaned up {len(stale_ids)} stale tracks")
+            if removed:
+                logger.info(f"Cleaned up {removed} stale tracks")
+            
+            # One summary per cleanup instead of a warning per eviction
+            evicted = self.evictions - self._evictions_reported
+            if evicted:
+                self._evictions_reported = self.evictions
+                logger.warning(f"Memory full, evicted {evicted} tracks since last cleanup")
     
     async def get_stats(self) -> dict:
-        """Get memory statistics"""
+        """Get memory statistics (O(1): records are fixed size)"""
         async with self._lock:
+            count = len(self._memory)
             return {
-                "tracked_objects": len(self._memory),
-                "memory_size_bytes": sum(len(str(v)) for v in self._memory.values())
+                "tracked_objects": count,
+                "evicted_tracks": self.evictions,
+                "memory_size_bytes": sys.getsizeof(self._memory) + count * TRACK_RECORD_BYTES
             }
 
 #  DISTANCE ESTIMATION (PROPER IMPLEMENTATION)
@@ -365,9 +663,58 @@ class ObjectMemory:
 class DistanceEstimator:
     """Accurate distance estimation using pinhole camera model"""
     
-    def __init__(self):
+    def __init__(self, class_names: Optional[Dict[int, str]] = None):
         self.focal_length = settings.camera_focal_length_px
         self.object_heights = settings.object_heights
+        self.set_class_names(class_names or {})
+    
+    def set_class_names(self, class_names: Dict[int, str]):
+        """
+        Build the class-ID-indexed height table for a model's classes
+        
+        Classes in object_heights that the model doesn't have get IDs after
+        the model's, and the last slot (index -1) stays NaN for unknown
+        classes, which use the generic fallback.
+        """
+        class_ids = {name.lower(): class_id for class_id, name in class_names.items()}
+        next_id = max(class_names, default=-1) + 1
+        for name in self.object_heights:
+            if name not in class_ids:
+                class_ids[name] = next_id
+                next_id += 1
+        
+        heights = np.full(next_id + 1, np.nan)
+        for name, class_id in class_ids.items():
+            if name in self.object_heights:
+                heights[class_id] = self.object_heights[name]
+        
+        self._class_ids = class_ids
+        self._heights = heights
+    
+    def estimate_distances(self, boxes: np.ndarray, class_ids: np.ndarray) -> np.ndarray:
+        """
+        Vectorised pinhole-model distance for a whole frame
+        
+        Args:
+            boxes: (N, 4) [x1, y1, x2, y2] bounding boxes
+            class_ids: (N,) class IDs (-1 for unknown)
+            
+        Returns:
+            (N,) estimated distances in meters
+        """
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        pixel_height = boxes[:, 3] - boxes[:, 1]
+        real_height = self._heights[np.asarray(class_ids, dtype=np.intp)]
+        
+        valid = pixel_height > 0
+        safe_height = np.where(valid, pixel_height, 1.0)
+        
+        # Pinhole formula, clamped to 0.3m..50m; generic heuristic if unknown class
+        known = np.clip((real_height * self.focal_length) / safe_height, 0.3, 50.0)
+        fallback = np.maximum(0.5, 10.0 / (safe_height / 100))
+        distance = np.where(np.isnan(real_height), fallback, known)
+        
+        return np.where(valid, distance, 10.0)  # 10m = far distance
     
     def estimate_distance(self, bbox: list, obj_class: str) -> float:
         """
@@ -381,26 +728,11 @@ class DistanceEstimator:
         Returns:
             Estimated distance in meters
         """
-        x1, y1, x2, y2 = bbox
-        pixel_height = y2 - y1
-        
-        if pixel_height <= 0:
-            return 10.0  # far distance
-        
-        # Get known real-world height for this object class
-        real_height = self.object_heights.get(obj_class.lower())
-        
-        if real_height is None:
-            # Fallback: use generic heuristic
-            return max(0.5, 10.0 / (pixel_height / 100))
-        
-        # Pinhole camera formula
-        distance = (real_height * self.focal_length) / pixel_height
-        
-        # Sanity check: clamp to reasonable range (0.3m to 50m)
-        distance = max(0.3, min(distance, 50.0))
-        
-        return distance
+        class_id = self._class_ids.get(obj_class.lower(), -1)
+        distances = self.estimate_distances(
+            np.array([bbox], dtype=np.float64), np.array([class_id])
+        )
+        return float(distances[0])
     
     def calibrate_focal_length(self, known_distance: float, pixel_height: float, 
                                real_height: float) -> float:
@@ -422,37 +754,284 @@ class DistanceEstimator:
 
 #  ASYNC HTTP CLIENT FOR ESP32
 
+# Compact UDP alert datagram (network byte order): magic "SA", version,
+# alert type code, flags, sequence number, distance in cm, class name
+# length, then the class name (UTF-8). Acks are "AK", version, sequence.
+ALERT_PACKET = struct.Struct("!2sBBBIHB")
+ACK_PACKET = struct.Struct("!2sBI")
+PACKET_VERSION = 1
+ALERT_TYPE_CODES = {"presence": 0, "approaching": 1, "fall_alert": 2}
+ALERT_TYPE_NAMES = {code: name for name, code in ALERT_TYPE_CODES.items()}
+FLAG_ACK_REQUESTED = 0x01
+
+# Alert types that are acked and retried over UDP (others are fire-and-forget)
+CRITICAL_ALERT_TYPES = {"fall_alert"}
+
+def encode_alert(seq: int, obj_class: str, distance: float, alert_type: str,
+                 ack: bool = False) -> bytes:
+    """Pack one alert into a datagram (about 12 bytes + class name)"""
+    name = obj_class.encode("utf-8")[:255]
+    distance_cm = min(0xFFFF, max(0, int(round(distance * 100))))
+    return ALERT_PACKET.pack(
+        b"SA", PACKET_VERSION, ALERT_TYPE_CODES[alert_type],
+        FLAG_ACK_REQUESTED if ack else 0, seq & 0xFFFFFFFF, distance_cm, len(name)
+    ) + name
+
+def decode_alert(data: bytes) -> dict:
+    """Unpack an alert datagram (raises ValueError if malformed)"""
+    if len(data) < ALERT_PACKET.size:
+        raise ValueError("short alert packet")
+    magic, version, type_code, flags, seq, distance_cm, name_len = ALERT_PACKET.unpack_from(data)
+    if magic != b"SA" or version != PACKET_VERSION or type_code not in ALERT_TYPE_NAMES:
+        raise ValueError("not a v1 alert packet")
+    name = data[ALERT_PACKET.size:ALERT_PACKET.size + name_len]
+    if len(name) != name_len:
+        raise ValueError("truncated class name")
+    return {
+        "seq": seq,
+        "object": name.decode("utf-8"),
+        "distance": distance_cm / 100,
+        "type": ALERT_TYPE_NAMES[type_code],
+        "ack": bool(flags & FLAG_ACK_REQUESTED)
+    }
+
+def encode_ack(seq: int) -> bytes:
+    return ACK_PACKET.pack(b"AK", PACKET_VERSION, seq)
+
+def decode_ack(data: bytes) -> Optional[int]:
+    """Sequence number of an ack datagram, or None"""
+    if len(data) != ACK_PACKET.size:
+        return None
+    magic, version, seq = ACK_PACKET.unpack(data)
+    return seq if magic == b"AK" and version == PACKET_VERSION else None
+
+class UDPAlertProtocol(asyncio.DatagramProtocol):
+    """
+    Connected UDP socket to the audio unit, matching acks to waiting sends
+
+    Socket errors (an ICMP port/host unreachable for an earlier datagram)
+    only arrive here, not at the send that caused them, so they go to
+    on_error: fire-and-forget alerts have no other way to report a dead unit.
+    """
+
+    def __init__(self, on_error: Optional[Callable[[Exception], None]] = None):
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.on_error = on_error
+        self._waiters: Dict[int, asyncio.Future] = {}
+        self.counts = {"sent": 0, "acked": 0, "retries": 0, "unacked": 0, "errors": 0}
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        waiter = self._waiters.get(decode_ack(data))
+        if waiter is not None and not waiter.done():
+            waiter.set_result(True)
+
+    def error_received(self, exc: Exception):
+        self.counts["errors"] += 1
+        if self.on_error is not None:
+            self.on_error(exc)
+
+    async def send(self, packet: bytes, seq: int, ack: bool,
+                   ack_timeout: float, retries: int) -> bool:
+        """
+        Send one alert datagram
+
+        Returns:
+            True once sent (fire-and-forget) or acked, False if every
+            attempt went unacked
+        """
+        if not ack:
+            self.transport.sendto(packet)
+            self.counts["sent"] += 1
+            return True
+
+        waiter = self._waiters[seq] = asyncio.get_running_loop().create_future()
+        try:
+            for attempt in range(1 + max(0, retries)):
+                if attempt:
+                    self.counts["retries"] += 1
+                self.transport.sendto(packet)
+                self.counts["sent"] += 1
+                try:
+                    await asyncio.wait_for(asyncio.shield(waiter), ack_timeout)
+                    self.counts["acked"] += 1
+                    return True
+                except asyncio.TimeoutError:
+                    continue
+            self.counts["unacked"] += 1
+            return False
+        finally:
+            self._waiters.pop(seq, None)
+
+class CircuitBreaker:
+    """
+    Fail-fast switch for the audio unit
+
+    Closed: alerts are sent normally. After `threshold` consecutive
+    connection failures it opens, and alerts fail immediately instead of
+    each waiting out esp32_timeout. The client's health probe closes it
+    again once the unit answers.
+    """
+
+    def __init__(self, threshold: int):
+        self.threshold = max(1, threshold)
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.counts = {"failures": 0, "opens": 0, "short_circuited": 0}
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        self.counts["short_circuited"] += 1
+        return False
+
+    def record_success(self):
+        self.consecutive_failures = 0
+
+    def record_failure(self) -> bool:
+        """Count a failure; True if this one opened the circuit"""
+        self.counts["failures"] += 1
+        self.consecutive_failures += 1
+        if self.state == "closed" and self.consecutive_failures >= self.threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self.counts["opens"] += 1
+            return True
+        return False
+
+    def close(self):
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def get_stats(self) -> dict:
+        """Get circuit breaker state and counters"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "open_for_s": round(time.monotonic() - self.opened_at, 1) if self.opened_at else 0.0,
+            **self.counts
+        }
+
 class ESP32AlertClient:
-    """Async HTTP client for ESP32 communication"""
+    """
+    Async client for one ESP32 alert unit (audio or haptic)
+
+    Defaults come from the ESP32_* settings; AlertSinks builds one client
+    per configured sink, each with its own URL, transport and breaker.
+    """
     
-    def __init__(self):
+    def __init__(self, name: str = "audio", url: Optional[str] = None,
+                 transport: Optional[str] = None, udp_port: Optional[int] = None,
+                 classes: Optional[List[str]] = None):
+        self.name = name
+        self.url = url or settings.esp32_audio_url
+        self.transport = (transport or settings.esp32_transport).lower()
+        self.udp_port = udp_port or settings.esp32_udp_port
+        self.classes = set(classes) if classes else None  # None = every class
         self.client: Optional[httpx.AsyncClient] = None
-        self.enabled = True
+        self._owns_client = False
+        self.breaker = CircuitBreaker(settings.esp32_breaker_threshold)
+        self._probe_task: Optional[asyncio.Task] = None
+        self.probes = 0
+        self.udp: Optional[UDPAlertProtocol] = None
+        self._seq = 0
+        self._send_ms: deque = deque(maxlen=200)
     
-    async def start(self):
-        """Initialize async HTTP client"""
-        self.client = httpx.AsyncClient(
+    def accepts(self, obj_class: str) -> bool:
+        """Whether this sink wants alerts for the class"""
+        return self.classes is None or obj_class in self.classes
+    
+    async def start(self, http_client: Optional[httpx.AsyncClient] = None):
+        """Initialize async HTTP client (and the UDP socket for udp sinks)"""
+        # HTTP is always set up: the health probe uses it. A shared pooled
+        # client can be passed in; otherwise the sink gets its own.
+        self._owns_client = http_client is None
+        self.client = http_client or httpx.AsyncClient(
             timeout=settings.esp32_timeout,
             limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
         )
-        logger.info(f"ESP32 client initialized (URL: {settings.esp32_audio_url})")
+        if self.transport == "udp":
+            host = httpx.URL(self.url).host
+            _, self.udp = await asyncio.get_running_loop().create_datagram_endpoint(
+                lambda: UDPAlertProtocol(on_error=self._on_udp_error),
+                remote_addr=(host, self.udp_port)
+            )
+            logger.info(f"ESP32 client '{self.name}' initialized (UDP: {host}:{self.udp_port})")
+        else:
+            logger.info(f"ESP32 client '{self.name}' initialized (URL: {self.url})")
     
     async def stop(self):
         """Close async HTTP client"""
-        if self.client:
+        if self._probe_task:
+            self._probe_task.cancel()
+            await asyncio.gather(self._probe_task, return_exceptions=True)
+            self._probe_task = None
+        if self.udp is not None:
+            self.udp.transport.close()
+            self.udp = None
+        if self.client and self._owns_client:
             await self.client.aclose()
-            logger.info("🌐 ESP32 client closed")
+            logger.info(f"🌐 ESP32 client '{self.name}' closed")
+    
+    @property
+    def health_url(self) -> str:
+        """The audio unit's GET / status endpoint"""
+        return str(httpx.URL(self.url).copy_with(path="/", query=None))
+    
+    def _on_failure(self):
+        """Count a connection failure; start probing if the circuit just opened"""
+        if self.breaker.record_failure():
+            logger.warning(
+                f"🔌 ESP32 '{self.name}' unreachable after {self.breaker.threshold} failures, "
+                f"alerts fail fast until {self.health_url} answers again"
+            )
+            self._probe_task = asyncio.create_task(self._probe_until_healthy())
+    
+    def _on_udp_error(self, exc: Exception):
+        """A datagram bounced (nothing listening): same as a failed HTTP connect"""
+        if self.breaker.state == "open":
+            return
+        logger.error(f"UDP alert to ESP32 '{self.name}' failed: {exc}")
+        self._on_failure()
+    
+    async def _probe_until_healthy(self):
+        """Poll the unit's health endpoint while the circuit is open"""
+        while self.breaker.state == "open":
+            await asyncio.sleep(settings.esp32_probe_interval)
+            self.probes += 1
+            try:
+                response = await self.client.get(self.health_url)
+                if response.status_code == 200:
+                    self.breaker.close()
+                    logger.info(f"🔌 ESP32 '{self.name}' back online ({response.text.strip()}), alerts resumed")
+            except httpx.HTTPError:
+                pass
     
     async def send_alert(self, obj_class: str, distance: float, alert_type: str) -> bool:
         """
-        Send alert to ESP32 using async HTTP
+        Send alert to ESP32 using async HTTP (or UDP)
         
         Returns:
             True if successful, False otherwise
         """
-        if not self.enabled or not self.client:
+        if not self.client:
             return False
-        
+        if not self.breaker.allow():
+            return False
+        start = time.perf_counter()
+        try:
+            if self.udp is not None:
+                return await self._send_udp(obj_class, distance, alert_type)
+            return await self._send_http(obj_class, distance, alert_type)
+        finally:
+            self._send_ms.append((time.perf_counter() - start) * 1000)
+    
+    async def _send_http(self, obj_class: str, distance: float, alert_type: str) -> bool:
+        """JSON POST to the unit's /alert endpoint"""
         payload = {
             "object": obj_class,
             "distance": round(distance, 2),
@@ -461,70 +1040,1489 @@ class ESP32AlertClient:
         
         try:
             response = await self.client.post(
-                settings.esp32_audio_url,
+                self.url,
                 json=payload
             )
             
+            self.breaker.record_success()  # the unit answered, even if with an error
             if response.status_code == 200:
-                logger.warning(f"🔊 {alert_type.upper()} ALERT → {payload}")  
+                logger.warning(f"🔊 {alert_type.upper()} ALERT [{self.name}] → {payload}")  
                 return True
             else:
                 logger.error(f"ESP32 responded with status {response.status_code}")
                 return False
                 
         except httpx.TimeoutException:
-            logger.error(f"ESP32 request timeout (>{settings.esp32_timeout}s)")
+            logger.error(f"ESP32 '{self.name}' request timeout (>{settings.esp32_timeout}s)")
+            self._on_failure()
             return False
         except httpx.ConnectError:
-            logger.error(f"Cannot connect to ESP32 at {settings.esp32_audio_url}")
+            logger.error(f"Cannot connect to ESP32 at {self.url}")
+            self._on_failure()
             return False
         except Exception as e:
             logger.error(f"ESP32 alert failed: {e}")
+            self._on_failure()
             return False
     
-    def toggle(self):
-        """Toggle ESP32 alerts on/off"""
+    async def _send_udp(self, obj_class: str, distance: float, alert_type: str) -> bool:
+        """One datagram per alert; critical types wait for an ack and retry"""
+        self._seq = (self._seq + 1) & 0xFFFFFFFF
+        ack = alert_type in CRITICAL_ALERT_TYPES
+        packet = encode_alert(self._seq, obj_class, distance, alert_type, ack)
+        try:
+            ok = await self.udp.send(packet, self._seq, ack,
+                                     settings.esp32_udp_ack_timeout, settings.esp32_udp_retries)
+        except OSError as e:  # e.g. ICMP port unreachable on a previous datagram
+            logger.error(f"UDP alert to ESP32 failed: {e}")
+            self._on_failure()
+            return False
+        
+        if not ok:
+            logger.error(f"ESP32 never acked {alert_type} (seq {self._seq})")
+            self._on_failure()
+            return False
+        if ack:
+            self.breaker.record_success()
+        logger.warning(f"🔊 {alert_type.upper()} ALERT [{self.name}, udp] → {obj_class} {distance:.2f}m")
+        return True
+    
+    def get_stats(self) -> dict:
+        """Get circuit breaker statistics, health probes and send latency"""
+        send_ms = sorted(self._send_ms)
+        stats = {
+            **self.breaker.get_stats(),
+            "probes": self.probes,
+            "send_ms_p50": round(send_ms[len(send_ms) // 2], 2) if send_ms else None,
+            "send_ms_max": round(send_ms[-1], 2) if send_ms else None
+        }
+        if self.udp is not None:
+            stats["udp"] = dict(self.udp.counts)
+        return stats
+
+#  ALERT DISPATCH
+
+# Alert priority per class (lower = more urgent), from Backdrop/server2.py;
+# "emergency" is the fall alert
+PRIORITY_LEVELS = {
+    "emergency": 0,  # fall detected
+    "train": 1,      # CRITICAL - immediate danger
+    "truck": 2,      # HIGH - large vehicle
+    "bus": 2,        # HIGH - large vehicle
+    "car": 3,        # MEDIUM - vehicle
+    "motorcycle": 3, # MEDIUM - vehicle
+    "bicycle": 3,    # MEDIUM - moving obstacle
+    "person": 3,     # MEDIUM - moving obstacle
+    "bench": 4,      # LOW - stationary, informational
+    "chair": 4,      # LOW - stationary, informational
+    "bed": 4,        # LOW - stationary, informational
+    "couch": 4,      # LOW - stationary, informational
+    "banana": 5      # LOWEST - fun/informational
+}
+
+# Minimum seconds between two played alerts of the same class and type, per priority
+ALERT_COOLDOWN = {
+    0: 0,   # Emergency: never held back
+    1: 2,   # Critical: 2 seconds
+    2: 3,   # High: 3 seconds
+    3: 4,   # Medium: 4 seconds
+    4: 8,   # Low: 8 seconds
+    5: 10   # Lowest: 10 seconds
+}
+
+PREEMPT_PRIORITY = 1  # alerts at or above this (train, fall) clear queued notices
+NOTICE_PRIORITY = 4   # bench/chair/... notices that get cleared
+
+class AlertDispatcher:
+    """
+    Priority scheduler for the ESP32 audio unit
+
+    process_frame only submits; one task delivers alerts in the background,
+    so a slow or unreachable audio unit never delays the frame response.
+
+    The unit plays one WAV at a time and cuts the current one off when a
+    new alert arrives, so:
+      - at most one alert per class waits; newer ones for that class are
+        coalesced into it (latest distance, "approaching" beats "presence")
+      - the most urgent pending alert goes next (PRIORITY_LEVELS)
+      - train and fall alerts drop the queued low-priority notices
+      - an alert type isn't replayed for a class within its ALERT_COOLDOWN;
+        a "presence" notice also waits out any other clip for that class,
+        but "approaching" is never held back by a presence notice
+      - sends are paced at least playback_s apart, except train and fall
+        alerts (PREEMPT_PRIORITY), which cut the playing clip off at once
+    """
+
+    def __init__(self, client: ESP32AlertClient, max_queue: int = 32,
+                 playback_s: float = 1.5):
+        self.client = client
+        self.max_queue = max(1, max_queue)
+        self.playback_s = playback_s
+        # class -> [priority, seq, queued_at, distance, alert_type]
+        self._pending: Dict[str, list] = {}
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+        self._last_played: Dict[str, Dict[str, float]] = {}  # class -> type -> time
+        self._next_send_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self.counts = {
+            "queued": 0, "coalesced": 0, "preempted": 0, "suppressed": 0,
+            "sent": 0, "failed": 0, "dropped": 0
+        }
+        self._latencies_ms: deque = deque(maxlen=200)  # submit -> delivery result
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def submit(self, obj_class: str, distance: float, alert_type: str) -> bool:
+        """
+        Queue an alert without waiting for it
+
+        Returns:
+            True if the alert is (or was merged into) a pending alert
+        """
+        priority = PRIORITY_LEVELS.get(obj_class, 5)
+        now = time.monotonic()
+        played = self._last_played.get(obj_class, {})
+        if alert_type == "presence":
+            last = max(played.values(), default=None)
+        else:
+            last = played.get(alert_type)
+        if last is not None and now - last < ALERT_COOLDOWN.get(priority, 5):
+            self.counts["suppressed"] += 1
+            return False
+
+        pending = self._pending.get(obj_class)
+        if pending is not None:
+            pending[3] = distance
+            if alert_type != "presence":
+                pending[4] = alert_type
+            self.counts["coalesced"] += 1
+            return True
+
+        if priority <= PREEMPT_PRIORITY:
+            notices = [c for c, p in self._pending.items() if p[0] >= NOTICE_PRIORITY]
+            for notice in notices:
+                del self._pending[notice]
+            self.counts["preempted"] += len(notices)
+
+        if len(self._pending) >= self.max_queue:
+            # Drop the least urgent (and newest) alert, which may be this one
+            victim = max(self._pending, key=lambda c: self._pending[c][:2])
+            if self._pending[victim][0] <= priority:
+                self.counts["dropped"] += 1
+                return False
+            del self._pending[victim]
+            self.counts["dropped"] += 1
+
+        self._seq += 1
+        self._pending[obj_class] = [priority, self._seq, now, distance, alert_type]
+        self.counts["queued"] += 1
+        self._wakeup.set()
+        return True
+
+    def _urgent_pending(self) -> bool:
+        return min(p[0] for p in self._pending.values()) <= PREEMPT_PRIORITY
+
+    def _pop_next(self) -> tuple:
+        obj_class = min(self._pending, key=lambda c: self._pending[c][:2])
+        return (obj_class, *self._pending.pop(obj_class))
+
+    async def _run(self):
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            # Let the previous clip finish; pick only after waiting, so an
+            # urgent alert that arrived meanwhile goes first. Urgent alerts
+            # don't wait: the unit cuts the current WAV off for them anyway.
+            delay = self._next_send_at - time.monotonic()
+            if delay > 0 and not self._urgent_pending():
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            obj_class, _, _, queued_at, distance, alert_type = self._pop_next()
+            self._next_send_at = time.monotonic() + self.playback_s
+            try:
+                ok = await self.client.send_alert(obj_class, distance, alert_type)
+            except Exception as e:
+                ok = False
+                logger.error(f"Alert dispatch failed: {e}")
+            self.counts["sent" if ok else "failed"] += 1
+            if ok:
+                self._last_played.setdefault(obj_class, {})[alert_type] = time.monotonic()
+            self._latencies_ms.append((time.monotonic() - queued_at) * 1000)
+
+    def get_stats(self) -> dict:
+        """Get alert delivery statistics"""
+        latencies = sorted(self._latencies_ms)
+        return {
+            **self.counts,
+            "pending": len(self._pending),
+            "pending_classes": sorted(self._pending, key=lambda c: self._pending[c][:2]),
+            "latency_ms_p50": round(latencies[len(latencies) // 2], 1) if latencies else None,
+            "latency_ms_max": round(latencies[-1], 1) if latencies else None
+        }
+
+class AlertSinks:
+    """
+    Every alert unit the user wears, fed from one alert stream
+
+    Each sink (ALERT_SINKS, or the single ESP32_AUDIO_URL unit if unset)
+    has its own URL, class filter, transport, breaker and AlertDispatcher.
+    submit() fans an alert out to every sink that wants the class. Each
+    sink's dispatcher delivers on its own task, so a slow sink never
+    delays the others or the frame response. HTTP sinks share one pooled
+    httpx.AsyncClient.
+    """
+
+    def __init__(self, sink_configs: Optional[List[dict]] = None):
+        configs = sink_configs or [{"name": "audio"}]
+        self.sinks: List[ESP32AlertClient] = []
+        for i, cfg in enumerate(configs):
+            self.sinks.append(ESP32AlertClient(
+                name=cfg.get("name") or f"sink{i}",
+                url=cfg.get("url"),
+                transport=cfg.get("transport"),
+                udp_port=cfg.get("udp_port"),
+                classes=cfg.get("classes")
+            ))
+        self.dispatchers = {
+            sink.name: AlertDispatcher(
+                sink,
+                max_queue=settings.alert_queue_size,
+                playback_s=settings.alert_playback_s
+            )
+            for sink in self.sinks
+        }
+        if len(self.dispatchers) != len(self.sinks):
+            raise ValueError("ALERT_SINKS names must be unique")
+        self.enabled = True
+        self.http: Optional[httpx.AsyncClient] = None
+
+    async def start(self):
+        per_sink = 5
+        self.http = httpx.AsyncClient(
+            timeout=settings.esp32_timeout,
+            limits=httpx.Limits(
+                max_keepalive_connections=per_sink * len(self.sinks),
+                max_connections=2 * per_sink * len(self.sinks)
+            )
+        )
+        for sink in self.sinks:
+            await sink.start(self.http)
+            self.dispatchers[sink.name].start()
+
+    async def stop(self):
+        for sink in self.sinks:
+            await self.dispatchers[sink.name].stop()
+            await sink.stop()
+        if self.http:
+            await self.http.aclose()
+            self.http = None
+            logger.info("🌐 ESP32 clients closed")
+
+    def submit(self, obj_class: str, distance: float, alert_type: str) -> int:
+        """
+        Queue an alert on every sink that takes its class
+
+        Returns:
+            Number of sinks that queued it (0 if alerts are toggled off)
+        """
+        if not self.enabled:
+            return 0
+        return sum(
+            self.dispatchers[sink.name].submit(obj_class, distance, alert_type)
+            for sink in self.sinks if sink.accepts(obj_class)
+        )
+
+    def toggle(self) -> bool:
+        """Toggle all alerts on/off"""
         self.enabled = not self.enabled
         status = 'ON' if self.enabled else 'OFF'
         logger.info(f"🌐 ESP32 alerts toggled {status}")
         return self.enabled
 
-#  BACKGROUND TASKS
+    def get_stats(self) -> dict:
+        """Per-sink config, breaker, send latency and delivery counters"""
+        return {
+            sink.name: {
+                "url": sink.url,
+                "transport": sink.transport,
+                "classes": sorted(sink.classes) if sink.classes else "all",
+                "client": sink.get_stats(),
+                "alerts": self.dispatchers[sink.name].get_stats()
+            }
+            for sink in self.sinks
+        }
 
-async def memory_cleanup_task(memory: ObjectMemory):
-    """Background task to periodically clean up stale tracks"""
-    while True:
-        await asyncio.sleep(settings.memory_cleanup_interval)
-        await memory.cleanup_stale_tracks()
-        stats = await memory.get_stats()
-        logger.info(f" Memory stats: {stats}")
+#  RAW FRAME INGEST
+
+MAX_FRAME_BYTES = 10_000_000  # 10MB
+MAX_POOLED_BUFFER = 1_000_000  # larger buffers (rare big or lying uploads) aren't kept
+
+class FrameBufferPool:
+    """Reusable request-body buffers for raw JPEG frames
+
+    Only touched from the event loop thread, so no lock is needed.
+    A buffer grows to whatever Content-Length a request claims, so buffers
+    over max_buffer_size go back to the allocator instead of the pool.
+    """
 
- # Rate limiter cleanup task       
+    def __init__(self, initial_size: int = 64 * 1024, max_pooled: int = 8,
+                 max_buffer_size: int = MAX_POOLED_BUFFER):
+        self.initial_size = initial_size
+        self.max_pooled = max_pooled
+        self.max_buffer_size = max_buffer_size
+        self._free: list = []
+
+    def acquire(self, size_hint: int = 0) -> bytearray:
+        """Get a buffer with room for at least size_hint bytes"""
+        buf = self._free.pop() if self._free else bytearray(self.initial_size)
+        if len(buf) < size_hint:
+            buf.extend(bytes(size_hint - len(buf)))
+        return buf
+
+    def release(self, buf: bytearray):
+        """Return a buffer to the pool (extra or oversized buffers are simply dropped)"""
+        if len(self._free) < self.max_pooled and len(buf) <= self.max_buffer_size:
+            self._free.append(buf)
+
+def _content_length(request: Request) -> int:
+    """Validate the Content-Length header and return it (0 if absent)"""
+    header = request.headers.get("content-length")
+    if header is None:
+        return 0
+    try:
+        length = int(header)
+    except ValueError:
+        raise HTTPException(400, f"Invalid Content-Length: {header}")
+    if length > MAX_FRAME_BYTES:
+        raise HTTPException(413, "File too large (max 10MB)")
+    return length
+
+async def read_raw_body(request: Request, buf: bytearray) -> int:
+    """
+    Stream the request body into buf without an intermediate bytes object
+
+    Returns:
+        Number of bytes written (buf grows if the body doesn't fit)
+    """
+    size = 0
+    async for chunk in request.stream():
+        end = size + len(chunk)
+        if end > MAX_FRAME_BYTES:
+            raise HTTPException(413, "File too large (max 10MB)")
+        buf[size:end] = chunk
+        size = end
+    return size
+
+#  FRAME DECODING
+
+# Start-of-frame markers that carry the image dimensions (not DHT/JPG/DAC)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                     0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+_REDUCED_DECODE_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+def jpeg_dimensions(data) -> Optional[tuple]:
+    """
+    Read (width, height) from a JPEG header without decoding it
+    
+    Returns:
+        (width, height), or None if data is not a parseable JPEG
+    """
+    size = len(data)
+    if size < 4 or data[0] != 0xFF or data[1] != 0xD8:
+        return None
+    
+    i = 2
+    while i + 9 < size:
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:  # fill byte
+            i += 1
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            height = (data[i + 5] << 8) | data[i + 6]
+            width = (data[i + 7] << 8) | data[i + 8]
+            return width, height
+        if 0xD0 <= marker <= 0xD7 or marker == 0x01:  # no length field
+            i += 2
+            continue
+        i += 2 + ((data[i + 2] << 8) | data[i + 3])
+    return None
+
+class FrameDecoder:
+    """Decode an encoded frame straight into one BGR ndarray"""
+    
+    def __init__(self, target_size: int, scaled: bool = True):
+        self.target_size = target_size
+        self.scaled = scaled
+        self._turbo = None
+        
+        if TurboJPEG is not None:
+            try:
+                self._turbo = TurboJPEG()
+                logger.info("🖼️  Using libjpeg-turbo for frame decoding")
+            except Exception as e:
+                logger.warning(f"PyTurboJPEG installed but unusable ({e}), using OpenCV")
+    
+    def _scale_factor(self, dims: Optional[tuple]) -> int:
+        """Largest DCT scale that keeps the long side >= the model input"""
+        if not self.scaled or dims is None:
+            return 1
+        long_side = max(dims)
+        for factor in (8, 4, 2):
+            if long_side // factor >= self.target_size:
+                return factor
+        return 1
+    
+    def decode(self, contents) -> tuple:
+        """
+        Decode an encoded image buffer
+        
+        Returns:
+            (bgr_array, scale) where scale maps decoded pixel coordinates
+            back to the original frame (1.0 unless a reduced decode was used)
+        """
+        dims = jpeg_dimensions(contents)
+        factor = self._scale_factor(dims)
+        
+        if self._turbo is not None and dims is not None:
+            # TurboJPEG's default pixel format is already BGR
+            img = self._turbo.decode(contents, scaling_factor=(1, factor))
+        else:
+            buf = np.frombuffer(contents, dtype=np.uint8)  # zero-copy view
+            img = cv2.imdecode(buf, _REDUCED_DECODE_FLAGS[factor])
+        
+        if img is None:
+            raise ValueError("Could not decode image")
+        
+        if factor == 1:
+            return img, 1.0
+        return img, dims[0] / img.shape[1]
+
+#  INFERENCE WORKER
+
+# Result handed to requests whose frame was replaced by a newer one
+FRAME_DROPPED = object()
+
+def _resolve_future(future: asyncio.Future, result, error: Optional[BaseException]):
+    """Complete a request future (runs on the event loop thread)"""
+    if future.done():  # request was cancelled (client went away)
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+# A device counts as streaming if its last frame is at most this many of its
+# own frame intervals old (ACTIVE_DEFAULT_S until it has sent two frames)
+ACTIVE_INTERVALS = 3
+ACTIVE_DEFAULT_S = 1.0
+
+class InferenceWorker:
+    """
+    Dedicated inference thread(s) fed by one latest-frame slot per device
+
+    Each device has at most one pending frame; a newer frame replaces an
+    unprocessed older one, whose request gets FRAME_DROPPED. So a camera
+    never waits behind its own backlog, only behind the frame in flight.
+
+    Frames from different cameras are micro-batched: once one is ready the
+    worker waits up to batch_window_ms for the other cameras it serves that
+    are actually streaming (sent a frame within the last few of their own
+    frame intervals), then runs one forward pass for up to batch_max_frames
+    frames. A lone live camera never waits, however many idle ones are
+    still pinned to the worker.
+
+    Each worker thread owns one model (YOLO objects aren't thread-safe) and
+    every device is pinned to one worker, so a device's tracker is only
+    ever touched by one thread.
+    """
+
+    def __init__(self, models: list, infer_fn, batch_window_ms: float = 0.0,
+                 batch_max_frames: int = 1):
+        self._models = models
+        self._infer = infer_fn
+        self.batch_window = batch_window_ms / 1000
+        self.batch_max_frames = max(1, batch_max_frames)
+        self._cond = threading.Condition()
+        self._slots: Dict[str, tuple] = {}  # device_id -> (img, future)
+        self._ready = [deque() for _ in models]  # per-worker device FIFO
+        self._affinity: Dict[str, int] = {}  # device_id -> worker index
+        self._worker_devices = [0] * len(models)  # devices pinned per worker
+        self._cadence: Dict[str, list] = {}  # device_id -> [last submit, smoothed interval]
+        self._busy: set = set()
+        self._threads: list = []
+        self._running = False
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self.batches = 0
+
+    @property
+    def num_workers(self) -> int:
+        return len(self._models)
+
+    @property
+    def model(self):
+        """The first worker's model (for class names and other metadata)"""
+        return self._models[0]
+
+    def start(self):
+        """Start the worker threads"""
+        self._running = True
+        for index in range(self.num_workers):
+            thread = threading.Thread(
+                target=self._run, args=(index,), name=f"inference-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info(
+            f"🧵 Inference workers started ({self.num_workers}, "
+            f"batch ≤{self.batch_max_frames} within {self.batch_window * 1000:.0f}ms)"
+        )
+
+    def stop(self):
+        """Stop the workers and drop any frames still waiting"""
+        with self._cond:
+            self._running = False
+            pending = list(self._slots.values())
+            self._slots.clear()
+            self._cond.notify_all()
+        for _, future in pending:
+            future.get_loop().call_soon_threadsafe(_resolve_future, future, FRAME_DROPPED, None)
+        for thread in self._threads:
+            thread.join(timeout=5.0)
+        self._threads.clear()
+
+    def submit(self, device_id: str, img) -> asyncio.Future:
+        """
+        Queue a decoded frame for inference (call from the event loop)
+
+        Returns:
+            Future resolving to the model result, or FRAME_DROPPED if a newer
+            frame from the same device arrived before this one was picked up
+        """
+        future = asyncio.get_running_loop().create_future()
+
+        with self._cond:
+            if not self._running:
+                future.set_result(FRAME_DROPPED)
+                return future
+
+            previous = self._slots.get(device_id)
+            self._slots[device_id] = (img, future)
+            self._note_submit(device_id)
+
+            if previous is not None:
+                # Still waiting in the slot: supersede it
+                self.frames_dropped += 1
+                _resolve_future(previous[1], FRAME_DROPPED, None)
+            elif device_id not in self._busy:
+                self._ready[self._worker_for(device_id)].append(device_id)
+                self._cond.notify_all()
+            # If the device is busy, its worker re-queues it when done
+
+        return future
+
+    def _worker_for(self, device_id: str) -> int:
+        """Pin a device to the least loaded worker on first sight"""
+        worker = self._affinity.get(device_id)
+        if worker is None:
+            worker = self._worker_devices.index(min(self._worker_devices))
+            self._affinity[device_id] = worker
+            self._worker_devices[worker] += 1
+        return worker
+
+    def _note_submit(self, device_id: str):
+        """Track a device's frame interval (lock held)"""
+        now = time.monotonic()
+        cadence = self._cadence.get(device_id)
+        if cadence is None:
+            self._cadence[device_id] = [now, None]
+            return
+        interval = now - cadence[0]
+        cadence[0] = now
+        cadence[1] = interval if cadence[1] is None else 0.8 * cadence[1] + 0.2 * interval
+
+    def _live_devices(self, index: int) -> int:
+        """Devices on this worker that sent a frame within ~3 of their intervals (lock held)"""
+        now = time.monotonic()
+        live = 0
+        for device_id, worker in self._affinity.items():
+            if worker != index:
+                continue
+            last, interval = self._cadence.get(device_id, (None, None))
+            if last is not None and now - last <= ACTIVE_INTERVALS * (interval or ACTIVE_DEFAULT_S):
+                live += 1
+        return live
+
+    def _collect_batch(self, index: int) -> Optional[list]:
+        """Wait for ready devices and take a batch of them (lock held)"""
+        ready = self._ready[index]
+        while self._running and not ready:
+            self._cond.wait()
+        if not self._running:
+            return None
+
+        # Only wait for cameras that could actually join this batch
+        wanted = min(self.batch_max_frames, self._live_devices(index))
+        deadline = time.monotonic() + self.batch_window
+        while self._running and len(ready) < wanted:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._cond.wait(remaining)
+
+        batch = []
+        while ready and len(batch) < self.batch_max_frames:
+            device_id = ready.popleft()
+            img, future = self._slots.pop(device_id)
+            self._busy.add(device_id)
+            batch.append((device_id, img, future))
+        return batch
+
+    def _run(self, index: int):
+        model = self._models[index]
+
+        while True:
+            with self._cond:
+                batch = self._collect_batch(index)
+            if batch is None:
+                return
+
+            device_ids = [device_id for device_id, _, _ in batch]
+            imgs = [img for _, img, _ in batch]
+            try:
+                results, error = self._infer(model, device_ids, imgs), None
+            except Exception as e:
+                results, error = [None] * len(batch), e
+
+            with self._cond:
+                self.batches += 1
+                self.frames_processed += len(batch)
+                for device_id in device_ids:
+                    self._busy.discard(device_id)
+                    if device_id in self._slots:
+                        self._ready[index].append(device_id)
+
+            for (_, _, future), result in zip(batch, results):
+                future.get_loop().call_soon_threadsafe(_resolve_future, future, result, error)
+
+    def release_device(self, device_id: str) -> bool:
+        """Forget a device's worker pinning; False if it still has work queued"""
+        with self._cond:
+            if device_id in self._slots or device_id in self._busy:
+                return False
+            worker = self._affinity.pop(device_id, None)
+            if worker is not None:
+                self._worker_devices[worker] -= 1
+            self._cadence.pop(device_id, None)
+            return True
+
+    def get_stats(self) -> dict:
+        """Get inference queue statistics"""
+        with self._cond:
+            return {
+                "workers": self.num_workers,
+                "frames_processed": self.frames_processed,
+                "frames_dropped": self.frames_dropped,
+                "batches": self.batches,
+                "avg_batch_size": round(self.frames_processed / self.batches, 2) if self.batches else 0.0,
+                "pending": len(self._slots),
+                "in_flight": len(self._busy)
+            }
+
+#  INFERENCE BACKEND
+
+# Backends besides plain PyTorch, mapped to the suffix ultralytics gives the export
+EXPORT_BACKENDS = {
+    "onnx": ".onnx",            # ONNX Runtime (pip install onnx onnxruntime)
+    "openvino": "_openvino_model",  # OpenVINO IR directory (pip install openvino)
+}
+
+def _file_sha256(path: str) -> str:
+    """Hash a model file in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def exported_model_path(model_path: str, backend: str, imgsz: int) -> Path:
+    """Cache location of an export, keyed by model hash and input size"""
+    digest = _file_sha256(model_path)[:16]
+    name = f"{Path(model_path).stem}-{digest}-{imgsz}{EXPORT_BACKENDS[backend]}"
+    return Path(settings.export_cache_dir) / name
+
+def quantized_model_path(model_path: str, imgsz: int) -> Path:
+    """Where quantize_model.py writes the INT8 ONNX model for this .pt"""
+    fp32 = exported_model_path(model_path, "onnx", imgsz)
+    return fp32.with_name(fp32.stem + "-int8.onnx")
+
+def export_model(model_path: str, backend: str, imgsz: int) -> str:
+    """
+    Export a .pt model for the given backend, once
+
+    The artifact is cached on disk, so later startups (and a changed
+    .pt file or input size, which gets a new key) only export when needed.
+    """
+    model_path = attempt_download_asset(model_path)  # e.g. bare "yolo11m.pt"
+    target = exported_model_path(model_path, backend, imgsz)
+
+    if target.exists():
+        logger.info(f"📦 Using cached {backend} export: {target}")
+        return str(target)
+
+    logger.info(f"📦 Exporting {model_path} to {backend} (imgsz={imgsz}), this happens once...")
+    exported = YOLO(model_path).export(format=backend, imgsz=imgsz, dynamic=True)
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.move(str(exported), str(target))
+    logger.info(f"📦 Cached {backend} export at {target}")
+    return str(target)
 
-async def rate_limiter_cleanup_task(limiter: RateLimiter):
-    """Background task to clean up old rate limit entries"""
+def load_model(model_path: Optional[str] = None, backend: Optional[str] = None,
+               imgsz: Optional[int] = None) -> YOLO:
+    """
+    Load the detection model on the configured backend
+
+    All backends go through ultralytics' YOLO wrapper, so results (and the
+    boxes process_frame reads) look the same regardless of runtime.
+    """
+    model_path = model_path or settings.yolo_model_path
+    backend = (backend or settings.inference_backend).lower()
+    imgsz = imgsz or settings.model_input_size
+
+    if backend == "torch":
+        return YOLO(model_path)
+    if backend == "onnx-int8":
+        int8_path = quantized_model_path(attempt_download_asset(model_path), imgsz)
+        if not int8_path.exists():
+            raise FileNotFoundError(
+                f"No INT8 model at {int8_path}, run quantize_model.py first"
+            )
+        return YOLO(str(int8_path), task="detect")
+    if backend not in EXPORT_BACKENDS:
+        raise ValueError(
+            f"Unknown INFERENCE_BACKEND '{backend}' "
+            f"(expected torch, onnx-int8, {', '.join(EXPORT_BACKENDS)})"
+        )
+    return YOLO(export_model(model_path, backend, imgsz), task="detect")
+
+def predictor_filter(class_ids: Dict[str, int]) -> dict:
+    """
+    Extra model.predict() arguments
+    
+    Boxes down to TRACK_CONF are always kept, because the tracker needs
+    them. CONFIDENCE_THRESHOLD is applied after tracking (result_arrays).
+    FILTER_IN_MODEL mode also limits the predictor to the classes we use.
+    
+    Args:
+        class_ids: class name -> ID map of the loaded model
+    """
+    if not settings.filter_in_model:
+        return {"conf": TRACK_CONF}
+    
+    wanted = ALERT_CLASSES | set(settings.display_classes)
+    missing = wanted - class_ids.keys()
+    if missing:
+        logger.warning(f"Classes not known to the model, ignored: {sorted(missing)}")
+    
+    allowed = sorted(class_ids[name] for name in wanted if name in class_ids)
+    logger.info(f"🎯 Predictor limited to {len(allowed)} classes")
+    return {"classes": allowed, "conf": TRACK_CONF}
+
+#  PER-DEVICE TRACKING
+
+# model.track() predicts at conf=0.1; BoT-SORT's second association needs those low-score boxes
+TRACK_CONF = 0.1
+
+def _accepts(fn, name: str) -> bool:
+    """Whether fn takes a keyword argument called name"""
+    params = inspect.signature(fn).parameters
+    return name in params or any(p.kind is p.VAR_KEYWORD for p in params.values())
+
+@lru_cache(maxsize=None)
+def _tracker_update_takes_feats(tracker_cls) -> bool:
+    return _accepts(tracker_cls.update, "feats")
+
+def _own_track_ids(tracker):
+    """
+    Give the tracker its own track ID counter
+
+    Older ultralytics (the pinned 8.1.0) draws IDs from one class-level
+    BaseTrack counter, and every new tracker resets it. With one tracker
+    per camera, a new camera would make the others reissue live IDs,
+    merging different objects in ObjectMemory. Newer versions already
+    count per tracker (tracker._ids) and are left alone.
+    """
+    if hasattr(tracker, "_ids"):
+        return tracker
+    ids = itertools.count(1)
+    init_track = tracker.init_track
+
+    def init_track_with_own_ids(*args, **kwargs):
+        tracks = init_track(*args, **kwargs)
+        for track in tracks:
+            track.next_id = ids.__next__  # used by activate() and re_activate(new_id=True)
+        return tracks
+
+    tracker.init_track = init_track_with_own_ids
+    return tracker
+
+def create_tracker():
+    """New multi-object tracker configured like model.track() would"""
+    cfg = IterableSimpleNamespace(**load_yaml(check_yaml(settings.tracker_config)))
+    tracker_cls = TRACKER_MAP[cfg.tracker_type]
+    # Older ultralytics trackers take the stream's frame rate; newer ones don't
+    if _accepts(tracker_cls.__init__, "frame_rate"):
+        return _own_track_ids(tracker_cls(args=cfg, frame_rate=30))
+    return _own_track_ids(tracker_cls(args=cfg))
+
+def apply_tracker(tracker, result):
+    """
+    Assign track IDs to one frame's detections
+
+    Same steps as ultralytics' on_predict_postprocess_end callback, but with
+    the caller's tracker instead of the predictor's single shared one.
+    Empty frames still update the tracker so lost tracks age out, and new
+    tracks stay hidden until the tracker confirms them.
+    """
+    det = result.boxes.cpu().numpy()
+    kwargs = {}
+    if _tracker_update_takes_feats(type(tracker)):
+        kwargs["feats"] = getattr(result, "feats", None)
+
+    tracks = tracker.update(det, result.orig_img, **kwargs)
+    if len(tracks) == 0:
+        if any(not t.is_activated for t in tracker.tracked_stracks):
+            return result[:0]  # unconfirmed tracks only: hide them
+        return result
+
+    idx = tracks[:, -1].astype(int)
+    result = result[idx]
+    result.update(boxes=torch.as_tensor(tracks[:, :-1], device=result.boxes.data.device))
+    return result
+
+def _tracker_size_bytes(tracker) -> int:
+    """Approximate memory held by a tracker's track objects"""
+    total = sys.getsizeof(tracker.__dict__)
+    for name in ("tracked_stracks", "lost_stracks", "removed_stracks"):
+        tracks = list(getattr(tracker, name, ()))  # copy: the worker may be mutating it
+        total += sys.getsizeof(tracks)
+        for track in tracks:
+            total += sys.getsizeof(track) + sys.getsizeof(track.__dict__)
+            for value in vars(track).values():
+                if isinstance(value, np.ndarray):
+                    total += value.nbytes
+    return total
+
+#  DEVICE REGISTRY
+
+def get_device_id(request: Request) -> str:
+    """Device identity from the device ID header, else the client IP"""
+    device_id = request.headers.get(settings.device_id_header, "").strip()
+    if device_id:
+        return device_id[:64]
+    return request.client.host if request.client else "unknown"
+
+class DeviceState:
+    """Everything the server keeps for one camera"""
+
+    def __init__(self, device_id: str):
+        self.device_id = device_id
+        self.memory = ObjectMemory()
+        self.tracker = None  # created by the inference worker on first frame
+        self.frames = 0
+        self.last_seen = time.monotonic()
+
+    async def get_stats(self) -> dict:
+        tracker = self.tracker
+        memory_stats = await self.memory.get_stats()
+        tracker_bytes = _tracker_size_bytes(tracker) if tracker is not None else 0
+        return {
+            "frames": self.frames,
+            "idle_s": round(time.monotonic() - self.last_seen, 1),
+            "tracked_objects": memory_stats["tracked_objects"],
+            "evicted_tracks": memory_stats["evicted_tracks"],
+            "memory_size_bytes": memory_stats["memory_size_bytes"],
+            "tracker_size_bytes": tracker_bytes,
+            "total_size_bytes": memory_stats["memory_size_bytes"] + tracker_bytes
+        }
+
+class DeviceRegistry:
+    """
+    Per-device tracker and ObjectMemory partitions
+
+    Devices are created on their first frame and evicted (tracker and
+    memory freed) once idle for longer than idle_timeout seconds.
+    Lookups and eviction happen on the event loop; the inference worker
+    only reads its device's tracker slot.
+    """
+
+    def __init__(self, idle_timeout: float):
+        self.idle_timeout = idle_timeout
+        self._devices: Dict[str, DeviceState] = {}
+        self.evicted = 0
+
+    def touch(self, device_id: str) -> DeviceState:
+        """Get (or create) a device's state and mark it active"""
+        device = self._devices.get(device_id)
+        if device is None:
+            device = self._devices[device_id] = DeviceState(device_id)
+            logger.info(f"📷 New device: {device_id}")
+        device.last_seen = time.monotonic()
+        device.frames += 1
+        return device
+
+    def tracker_for(self, device_id: str):
+        """The device's tracker, created on first use (inference thread)"""
+        device = self._devices.get(device_id)
+        if device is None:
+            # Evicted between submit and inference: track this frame alone
+            return create_tracker()
+        if device.tracker is None:
+            device.tracker = create_tracker()
+        return device.tracker
+
+    def __iter__(self):
+        return iter(list(self._devices.values()))
+
+    def __len__(self):
+        return len(self._devices)
+
+    def evict_idle(self, inference: "InferenceWorker") -> list:
+        """Drop devices idle for longer than idle_timeout"""
+        now = time.monotonic()
+        evicted = []
+        for device_id, device in list(self._devices.items()):
+            if now - device.last_seen < self.idle_timeout:
+                continue
+            if not inference.release_device(device_id):
+                continue  # frame still queued or in flight
+            del self._devices[device_id]
+            evicted.append(device_id)
+
+        if evicted:
+            self.evicted += len(evicted)
+            logger.info(f"📷 Evicted {len(evicted)} idle device(s): {', '.join(evicted)}")
+        return evicted
+
+    async def get_stats(self) -> dict:
+        """Per-device statistics plus totals"""
+        per_device = {}
+        for device in self:
+            per_device[device.device_id] = await device.get_stats()
+        return {
+            "active": len(per_device),
+            "evicted": self.evicted,
+            "idle_timeout_s": self.idle_timeout,
+            "devices": per_device
+        }
+
+def run_batch(model, device_ids: list, imgs: list) -> list:
+    """One forward pass over a batch of frames, then per-device tracking"""
+    results = model.predict(imgs, imgsz=settings.model_input_size, **app.state.predict_kwargs)
+
+    return [
+        apply_tracker(app.state.devices.tracker_for(device_id), result)
+        for device_id, result in zip(device_ids, results)
+    ]
+
+#  DISPLAY RENDER THREAD
+
+class DisplayRenderer:
+    """
+    Video window on its own thread
+
+    process_frame only drops the newest (frame, detections, scale) into a
+    single slot; an unrendered older frame is simply replaced. The render
+    thread draws at most max_fps frames per second and owns every HighGUI
+    call (imshow, waitKey, destroyAllWindows), so the event loop never
+    blocks on GUI work. 't' toggles alerts, 'q' closes the window.
+    """
+
+    WINDOW = "ESP32-CAM Detection"
+
+    def __init__(self, max_fps: float = 15.0):
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self._cond = threading.Condition()
+        self._slot: Optional[tuple] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._running = False
+        self.frames_rendered = 0
+        self.frames_replaced = 0
+        self.render_ms_total = 0.0
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="display", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def submit(self, img_array, detections, scale: float = 1.0):
+        """Hand the newest frame to the renderer (never blocks on drawing)"""
+        with self._cond:
+            if self._slot is not None:
+                self.frames_replaced += 1
+            self._slot = (img_array, detections, scale)
+            self._cond.notify()
+
+    def _run(self):
+        last_render = 0.0
+        while True:
+            with self._cond:
+                # Wake at least every 50 ms so waitKey keeps the window responsive
+                if self._running and self._slot is None:
+                    self._cond.wait(timeout=0.05)
+                if not self._running:
+                    break
+                wait = last_render + self.min_interval - time.monotonic()
+                item = self._slot if wait <= 0 else None
+                if item is not None:
+                    self._slot = None
+
+            if item is not None:
+                start = time.perf_counter()
+                cv2.imshow(self.WINDOW, render_frame(*item))
+                self.render_ms_total += (time.perf_counter() - start) * 1000
+                self.frames_rendered += 1
+                last_render = time.monotonic()
+
+            key = cv2.waitKey(max(1, int(wait * 1000)) if item is None and wait > 0 else 1) & 0xFF
+            if key == ord('t'):
+                self._loop.call_soon_threadsafe(app.state.alert_sinks.toggle)
+            elif key == ord('q'):
+                self._loop.call_soon_threadsafe(setattr, app.state, "display_enabled", False)
+                logger.warning("🛑 Display window closed (server still running)")
+                break
+
+        cv2.destroyAllWindows()
+
+    def get_stats(self) -> dict:
+        """Get render thread statistics"""
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "frames_rendered": self.frames_rendered,
+            "frames_replaced": self.frames_replaced,
+            "avg_render_ms": round(self.render_ms_total / self.frames_rendered, 2)
+                             if self.frames_rendered else 0.0
+        }
+
+#  MJPEG PREVIEW
+
+class PreviewStreamer:
+    """
+    Annotated MJPEG preview for headless deployments (GET /preview)
+
+    Costs nothing while nobody watches: submit() returns immediately and no
+    encoder thread exists. The first viewer starts the encoder thread; it
+    annotates and JPEG-encodes the newest frame per device at most max_fps
+    times a second, and every viewer streams the same encoded bytes, so
+    another viewer adds only socket writes. The last viewer leaving stops
+    the thread.
+    """
+
+    BOUNDARY = "frame"
+
+    def __init__(self, max_fps: float = 10.0, jpeg_quality: int = 70):
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.jpeg_quality = jpeg_quality
+        self._cond = threading.Condition()
+        self._slots: Dict[str, tuple] = {}  # device_id -> (img, detections, scale)
+        self._viewers: Dict[Optional[str], int] = defaultdict(int)  # device filter -> count
+        self._thread: Optional[threading.Thread] = None
+        self._generation = 0  # bumped on start/stop; a thread exits once it's stale
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._frame_event: Optional[asyncio.Event] = None
+        self._seq = 0
+        self.latest: Dict[str, tuple] = {}  # device_id -> (seq, newest encoded frame)
+        self.frames_encoded = 0
+        self.encode_ms_total = 0.0
+        self.bytes_sent = 0
+
+    @property
+    def viewers(self) -> int:
+        return sum(self._viewers.values())
+
+    def _wanted(self, device_id: str) -> bool:
+        return bool(self._viewers.get(None) or self._viewers.get(device_id))
+
+    def submit(self, device_id: str, img_array, detections, scale: float = 1.0):
+        """Offer a processed frame; a no-op unless someone is watching this device"""
+        if not self._wanted(device_id):
+            return
+        with self._cond:
+            self._slots[device_id] = (img_array, detections, scale)
+            self._cond.notify()
+
+    async def stream(self, device_id: Optional[str] = None):
+        """multipart/x-mixed-replace body for one viewer"""
+        self._add_viewer(device_id)
+        sent: Dict[str, int] = {}
+        try:
+            while True:
+                event = self._frame_event
+                await event.wait()
+                for dev, (seq, jpeg) in list(self.latest.items()):
+                    if (device_id is not None and dev != device_id) or sent.get(dev) == seq:
+                        continue
+                    sent[dev] = seq
+                    self.bytes_sent += len(jpeg)
+                    yield (
+                        f"--{self.BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                        f"Content-Length: {len(jpeg)}\r\n\r\n"
+                    ).encode() + jpeg + b"\r\n"
+        finally:
+            self._remove_viewer(device_id)
+
+    def _add_viewer(self, device_id: Optional[str]):
+        self._viewers[device_id] += 1
+        if self._thread is None:
+            self._loop = asyncio.get_running_loop()
+            self._frame_event = asyncio.Event()
+            with self._cond:
+                self._generation += 1
+            self._thread = threading.Thread(
+                target=self._run, args=(self._generation,), name="preview", daemon=True
+            )
+            self._thread.start()
+            logger.info("📺 Preview viewer connected, encoder started")
+
+    def _remove_viewer(self, device_id: Optional[str]):
+        self._viewers[device_id] -= 1
+        if self._viewers[device_id] <= 0:
+            del self._viewers[device_id]
+        if not self._viewers and self._thread is not None:
+            with self._cond:
+                self._generation += 1
+                self._slots.clear()
+                self._cond.notify()
+            self._thread = None  # exits on its own; never join on the event loop
+            self.latest.clear()
+            logger.info("📺 Last preview viewer left, encoder stopped")
+
+    def _publish(self):
+        """On the event loop: wake every viewer waiting for a frame"""
+        event, self._frame_event = self._frame_event, asyncio.Event()
+        event.set()
+
+    def _run(self, generation: int):
+        last_encode = 0.0
+        while True:
+            with self._cond:
+                while self._generation == generation and not self._slots:
+                    self._cond.wait()
+                if self._generation != generation:
+                    return
+                wait = last_encode + self.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)  # cap the encode rate; newer frames replace slots meanwhile
+            with self._cond:
+                if self._generation != generation:
+                    return
+                slots, self._slots = self._slots, {}
+
+            start = time.perf_counter()
+            for device_id, item in slots.items():
+                ok, jpeg = cv2.imencode(
+                    ".jpg", render_frame(*item), [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]
+                )
+                if ok:
+                    self._seq += 1
+                    self.latest[device_id] = (self._seq, jpeg.tobytes())
+                    self.frames_encoded += 1
+            self.encode_ms_total += (time.perf_counter() - start) * 1000
+            last_encode = time.monotonic()
+            self._loop.call_soon_threadsafe(self._publish)
+
+    def get_stats(self) -> dict:
+        """Get preview statistics"""
+        return {
+            "viewers": self.viewers,
+            "encoder_running": self._thread is not None,
+            "frames_encoded": self.frames_encoded,
+            "avg_encode_ms": round(self.encode_ms_total / self.frames_encoded, 2)
+                             if self.frames_encoded else 0.0,
+            "bytes_sent": self.bytes_sent
+        }
+
+#  METRICS
+
+# Upper bounds (seconds) of the latency histogram buckets, plus +Inf
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Stages of one frame, in pipeline order
+FRAME_STAGES = ("read", "decode", "inference", "postprocess", "memory", "alerts", "display")
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram
+
+    observe() is a bisect and two additions. Only called from the event
+    loop thread, so no lock is needed.
+    """
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.sum += seconds
+
+    def lines(self, name: str, labels: str = "") -> list:
+        """Prometheus _bucket/_sum/_count lines (buckets are cumulative)"""
+        out, total = [], 0
+        prefix = f"{labels}," if labels else ""
+        suffix = f"{{{labels}}}" if labels else ""
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            out.append(f'{name}_bucket{{{prefix}le="{le}"}} {total}')
+        out.append(f"{name}_sum{suffix} {self.sum!r}")
+        out.append(f"{name}_count{suffix} {total}")
+        return out
+
+class Metrics:
+    """
+    Per-stage frame latency histograms and frame/alert/error counters
+
+    process_frame times each stage with perf_counter() via lap(), which
+    observes the time since the previous lap, appends it to the frame's
+    own timings and returns the new timestamp. render() writes everything
+    in the Prometheus text format.
+    """
+
+    def __init__(self):
+        self.stages = {stage: Histogram() for stage in FRAME_STAGES}
+        self.frame = Histogram()
+        self.frames = {"ok": 0, "dropped": 0, "error": 0}
+        self.rate_limited = 0
+        self.alerts_submitted = 0
+
+    def lap(self, stage: str, start: float, timings: list) -> float:
+        """Record stage as having run from start until now; returns now"""
+        now = time.perf_counter()
+        histogram = self.stages[stage]
+        elapsed = now - start
+        histogram.counts[bisect_left(histogram.bounds, elapsed)] += 1  # observe(), inlined
+        histogram.sum += elapsed
+        timings.append((stage, elapsed))
+        return now
+
+    def frame_done(self, outcome: str, started: float) -> float:
+        """Count a finished frame; returns its end-to-end time in seconds"""
+        total = time.perf_counter() - started
+        self.frames[outcome] += 1
+        self.frame.observe(total)
+        return total
+
+    def render(self, alert_sinks: Optional["AlertSinks"] = None) -> str:
+        """Everything in the Prometheus text exposition format"""
+        lines = [
+            "# HELP senseaid_stage_seconds Time spent in each stage of a frame",
+            "# TYPE senseaid_stage_seconds histogram",
+        ]
+        for stage, histogram in self.stages.items():
+            lines += histogram.lines("senseaid_stage_seconds", f'stage="{stage}"')
+
+        lines += [
+            "# HELP senseaid_frame_seconds End-to-end time of a frame request",
+            "# TYPE senseaid_frame_seconds histogram",
+        ]
+        lines += self.frame.lines("senseaid_frame_seconds")
+
+        lines += [
+            "# HELP senseaid_frames_total Frames processed, by outcome",
+            "# TYPE senseaid_frames_total counter",
+        ]
+        lines += [f'senseaid_frames_total{{outcome="{k}"}} {v}' for k, v in self.frames.items()]
+        lines += [
+            "# HELP senseaid_rate_limited_total Frames rejected by the rate limiter",
+            "# TYPE senseaid_rate_limited_total counter",
+            f"senseaid_rate_limited_total {self.rate_limited}",
+            "# HELP senseaid_alerts_submitted_total Alerts raised by frames (before fan-out)",
+            "# TYPE senseaid_alerts_submitted_total counter",
+            f"senseaid_alerts_submitted_total {self.alerts_submitted}",
+        ]
+
+        if alert_sinks is not None:
+            lines += [
+                "# HELP senseaid_alerts_total Alert dispatcher outcomes, per sink",
+                "# TYPE senseaid_alerts_total counter",
+            ]
+            for sink, dispatcher in alert_sinks.dispatchers.items():
+                lines += [
+                    f'senseaid_alerts_total{{sink="{sink}",outcome="{k}"}} {v}'
+                    for k, v in dispatcher.counts.items()
+                ]
+        return "\n".join(lines) + "\n"
+
+#  FRAME TRACING
+
+def server_timing(timings: list, total: float) -> str:
+    """Server-Timing header value from a frame's (stage, seconds) laps"""
+    parts = [f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in timings]
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+class FrameTracer:
+    """
+    Frame sequence IDs and a ring buffer of recent per-frame traces
+
+    Every frame gets the next ID, which goes back to the camera as the
+    X-Frame-ID header (and frame_id in the JSON), next to its stage
+    timings in Server-Timing. The last `size` frames are kept as plain
+    tuples and only turned into dicts when /traces asks for them. Only
+    touched from the event loop thread.
+    """
+
+    def __init__(self, size: int):
+        self.size = max(0, size)
+        self.last_id = 0
+        self.traces: Optional[deque] = deque(maxlen=self.size) if self.size else None
+
+    def next_id(self) -> int:
+        self.last_id += 1
+        return self.last_id
+
+    def record(self, frame_id: int, device_id: str, outcome: str, total: float,
+               timings: list, detections: int, alerts: int):
+        if self.traces is not None:
+            self.traces.append(
+                (frame_id, device_id, time.time(), outcome, total, timings, detections, alerts)
+            )
+
+    def dump(self, device: Optional[str] = None, min_ms: float = 0.0,
+             slowest: bool = False, limit: int = 100) -> list:
+        """
+        Buffered traces, newest first (or slowest first)
+
+        Returns:
+            List of dicts with frame_id, device, time, outcome, total_ms,
+            per-stage ms, detection and alert counts
+        """
+        if self.traces is None:
+            return []
+        min_s = min_ms / 1000
+        rows = [
+            trace for trace in self.traces
+            if trace[4] >= min_s and (device is None or trace[1] == device)
+        ]
+        if slowest:
+            rows.sort(key=lambda trace: trace[4], reverse=True)
+        else:
+            rows.reverse()
+        return [
+            {
+                "frame_id": frame_id,
+                "device": device_id,
+                "time": round(wall, 3),
+                "outcome": outcome,
+                "total_ms": round(total * 1000, 2),
+                "stages_ms": {stage: round(seconds * 1000, 2) for stage, seconds in timings},
+                "detections": detections,
+                "alerts": alerts
+            }
+            for frame_id, device_id, wall, outcome, total, timings, detections, alerts
+            in rows[:max(0, limit)]
+        ]
+
+    def get_stats(self) -> dict:
+        return {
+            "last_frame_id": self.last_id,
+            "buffered": len(self.traces) if self.traces is not None else 0,
+            "size": self.size
+        }
+
+#  BACKGROUND TASKS
+
+async def memory_cleanup_task(devices: DeviceRegistry, inference: InferenceWorker):
+    """Background task to periodically clean up stale tracks and idle devices"""
     while True:
-        await asyncio.sleep(60)  # Clean up every minute
-        await limiter.cleanup_old_clients()
+        await asyncio.sleep(settings.memory_cleanup_interval)
+        devices.evict_idle(inference)
+        for device in devices:
+            await device.memory.cleanup_stale_tracks()
+            stats = await device.memory.get_stats()
+            logger.info(f" Memory stats [{device.device_id}]: {stats}")
 
 #  APPLICATION LIFESPAN MANAGEMENT
 
+def create_inference_worker() -> InferenceWorker:
+    """Load the model (one copy per worker) and build the inference worker"""
+    logger.info(f"🧠 Loading YOLO model from {settings.yolo_model_path} ({settings.inference_backend})...")
+    models = [load_model() for _ in range(max(1, settings.inference_workers))]
+    logger.info("✅ YOLO loaded")
+    
+    return InferenceWorker(
+        models,
+        run_batch,
+        batch_window_ms=settings.batch_window_ms,
+        batch_max_frames=settings.batch_max_frames
+    )
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application startup and shutdown"""
     # Startup
     logger.info("🚀 Starting application...")
     
-    # Initialize ESP32 client
-    await app.state.esp32_client.start()
+    # Initialize the ESP32 alert sinks and their dispatchers
+    await app.state.alert_sinks.start()
+    
+    # Load YOLO model(s) and start inference worker thread(s)
+    app.state.inference = create_inference_worker()
+    names = app.state.inference.model.names
+    app.state.class_ids = {name: class_id for class_id, name in names.items()}
+    app.state.alert_class_ids = np.array(
+        [app.state.class_ids[name] for name in ALERT_CLASSES if name in app.state.class_ids],
+        dtype=np.int64
+    )
+    app.state.predict_kwargs = predictor_filter(app.state.class_ids)
+    app.state.distance_estimator.set_class_names(names)
+    app.state.inference.start()
+    if app.state.display_enabled:
+        app.state.renderer.start(asyncio.get_running_loop())
     
     # Start background cleanup task
     cleanup_task = asyncio.create_task(
-        memory_cleanup_task(app.state.object_memory)
-    )
-    # Start rate limiter cleanup task  # ← ADD THIS
-    rate_limit_cleanup_task = asyncio.create_task(
-        rate_limiter_cleanup_task(app.state.rate_limiter)
+        memory_cleanup_task(app.state.devices, app.state.inference)
     )
     
     logger.info("✅ Application started")
@@ -534,9 +2532,9 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("🛑 Shutting down application...")
     cleanup_task.cancel()
-    rate_limit_cleanup_task.cancel()
-    await app.state.esp32_client.stop()
-    cv2.destroyAllWindows()
+    app.state.inference.stop()
+    await app.state.alert_sinks.stop()
+    app.state.renderer.stop()
     logger.info("✅ Application stopped")
 
 #  FASTapi
@@ -544,16 +2542,21 @@ async def lifespan(app: FastAPI):
 app = FastAPI(lifespan=lifespan)
 
 # Initialize application state
-app.state.object_memory = ObjectMemory()
-app.state.esp32_client = ESP32AlertClient()
+app.state.devices = DeviceRegistry(settings.device_idle_timeout)
+app.state.alert_sinks = AlertSinks(settings.alert_sinks)
 app.state.distance_estimator = DistanceEstimator()
 app.state.display_enabled = settings.display_enabled
-app.state.rate_limiter = RateLimiter(max_requests=30, window_seconds=60)
-
-# Load YOLO model
-logger.info(f"🧠 Loading YOLO model from {settings.yolo_model_path}...")
-model = YOLO(settings.yolo_model_path)
-logger.info("✅ YOLO loaded")
+app.state.renderer = DisplayRenderer(settings.display_max_fps)
+app.state.preview = PreviewStreamer(settings.preview_max_fps, settings.preview_jpeg_quality)
+app.state.rate_limiter = RateLimiter(
+    max_requests=settings.rate_limit_frames,
+    window_seconds=settings.rate_limit_window,
+    overrides=settings.rate_limit_overrides
+)
+app.state.frame_buffers = FrameBufferPool()
+app.state.frame_decoder = FrameDecoder(settings.model_input_size, settings.scaled_decode)
+app.state.metrics = Metrics()
+app.state.tracer = FrameTracer(settings.frame_trace_size)
 
 # Alert object classes
 ALERT_CLASSES = {
@@ -565,13 +2568,16 @@ ALERT_CLASSES = {
 
 def _overlay_status(img):
     """Overlay current mode on the video frame"""
-    mode = f"ESP32 ALERTS: {'ON' if app.state.esp32_client.enabled else 'OFF'}"
+    mode = f"ESP32 ALERTS: {'ON' if app.state.alert_sinks.enabled else 'OFF'}"
     hint = "Press 't' to toggle, 'q' to close window"
     cv2.putText(img, mode, (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
     cv2.putText(img, hint, (10, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.55, (255, 255, 0), 2)
 
-def draw_detections(img_array, detections):
-    """Draw bounding boxes and labels on image"""
+def draw_detections(img_array, detections, scale: float = 1.0):
+    """Draw bounding boxes and labels on image
+    
+    scale is the decoder's frame-to-image ratio; bboxes are in frame pixels.
+    """
     img = img_array.copy()
     
     for det in detections:
@@ -581,7 +2587,7 @@ def draw_detections(img_array, detections):
         track_id = det.get('track_id')
         distance = det.get('distance', 0)
         
-        x1, y1, x2, y2 = map(int, bbox)
+        x1, y1, x2, y2 = (int(v / scale) for v in bbox)
         
         # Color based on alert priority
         if class_name in ALERT_CLASSES:
@@ -624,12 +2630,9 @@ def draw_detections(img_array, detections):
     
     return img
 
-def display_frame(img_array, detections):
-    """Display frame with detections"""
-    if not app.state.display_enabled:
-        return
-    
-    annotated_img = draw_detections(img_array, detections)
+def render_frame(img_array, detections, scale: float = 1.0):
+    """Annotated, display-sized copy of a frame"""
+    annotated_img = draw_detections(img_array, detections, scale)
     _overlay_status(annotated_img)
     
     # Resize for display if too large
@@ -639,16 +2642,73 @@ def display_frame(img_array, detections):
         new_width = 1280
         new_height = int(height * scale)
         annotated_img = cv2.resize(annotated_img, (new_width, new_height))
+    return annotated_img
+
+#  DETECTION POST-PROCESSING
+
+def result_arrays(result, scale: float = 1.0) -> tuple:
+    """
+    Pull one frame's boxes off the tensor in a single transfer
     
-    cv2.imshow("ESP32-CAM Detection", annotated_img)
-    key = cv2.waitKey(1) & 0xFF
+    Returns:
+        (xyxy (N,4) float, conf (N,), cls (N,) int, ids (N,) int or None),
+        already filtered by CONFIDENCE_THRESHOLD and scaled to frame pixels
+    """
+    boxes = result.boxes
+    data = boxes.data.cpu().numpy()  # rows: x1 y1 x2 y2 [id] conf cls
     
-    if key == ord('t'):
-        app.state.esp32_client.toggle()
-    elif key == ord('q'):
-        app.state.display_enabled = False
-        cv2.destroyAllWindows()
-        logger.warning("🛑 Display window closed (server still running)")
+    conf = data[:, -2]
+    keep = conf >= settings.confidence_threshold
+    if not keep.all():
+        data = data[keep]
+        conf = data[:, -2]
+    
+    xyxy = data[:, :4].astype(np.float64)
+    if scale != 1.0:
+        xyxy = xyxy * scale  # back to frame pixels
+    cls = data[:, -1].astype(np.int64)
+    ids = data[:, 4].astype(np.int64) if boxes.is_track else None
+    return xyxy, conf, cls, ids
+
+def postprocess_result(result, names: dict, alert_class_ids: np.ndarray,
+                       estimator: "DistanceEstimator", scale: float = 1.0) -> tuple:
+    """
+    Turn one frame's result into JSON rows and alert candidates
+    
+    Returns:
+        (detections, alert_rows) where alert_rows holds
+        (track_id, distance, class_name) for tracked alert-class boxes,
+        in box order
+    """
+    xyxy, conf, cls, ids = result_arrays(result, scale)
+    count = len(cls)
+    if count == 0:
+        return [], []
+    
+    bboxes = xyxy.tolist()
+    class_names = [names[c] for c in cls.tolist()]
+    track_ids = ids.tolist() if ids is not None else [None] * count
+    distances = estimator.estimate_distances(xyxy, cls).tolist()
+    
+    detections = [
+        {
+            "class": class_name,
+            "confidence": confidence,
+            "bbox": bbox,
+            "track_id": track_id,
+            "distance": distance
+        }
+        for class_name, confidence, bbox, track_id, distance
+        in zip(class_names, conf.tolist(), bboxes, track_ids, distances)
+    ]
+    
+    # Alert logic only applies to tracked objects in alert classes
+    alert_rows = []
+    if ids is not None:
+        for i in np.flatnonzero(np.isin(cls, alert_class_ids)).tolist():
+            alert_rows.append((track_ids[i], distances[i], class_names[i]))
+    
+    return detections, alert_rows
 
 #  API ENDPOINTS
 
@@ -656,7 +2716,7 @@ def display_frame(img_array, detections):
 async def receive_frame(request: Request, file: UploadFile = File(...)):
     """
     Process uploaded frame and detect objects
-    
+
     Returns detection results and sends alerts to ESP32 if needed
     """
     # LAYER 1: Content-Type Validation
@@ -666,105 +2726,145 @@ async def receive_frame(request: Request, file: UploadFile = File(...)):
             status_code=400,
             detail=f"Only image files accepted. Received: {file.content_type}"
         )
-    
-    
-    # Rate Limiting
-    client_ip = request.client.host
-    if not await app.state.rate_limiter.check_rate_limit(client_ip):
+
+    device_id = get_device_id(request)
+    await enforce_rate_limit(device_id)
+
+    started = time.perf_counter()
+    contents = await file.read()
+
+    # Validate size
+    if len(contents) > MAX_FRAME_BYTES:
+        raise HTTPException(413, "File too large (max 10MB)")
+
+    timings = []
+    app.state.metrics.lap("read", started, timings)
+    return await process_frame(contents, device_id, started, timings)
+
+@app.post("/frame/raw")
+async def receive_raw_frame(request: Request):
+    """
+    Process a frame POSTed as a bare image/jpeg body
+
+    This is what esp32_cam_sender.ino sends (http.POST(fb->buf, fb->len)),
+    so no multipart parsing or spooled temp file is involved.
+    """
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("image/"):
+        logger.warning(f"Rejected raw frame with Content-Type: {content_type}")
         raise HTTPException(
-            status_code=429,
-            detail="Rate limit exceeded. Max 30 frames per minute."
+            status_code=400,
+            detail=f"Only image bodies accepted. Received: {content_type or None}"
         )
-    
+
+    device_id = get_device_id(request)
+    await enforce_rate_limit(device_id)
+
+    pool = app.state.frame_buffers
+    buf = pool.acquire(_content_length(request))
     try:
-        contents = await file.read()
-        
-        # Validate size
-        if len(contents) > 10_000_000:  # 10MB
-            raise HTTPException(413, "File too large (max 10MB)")
-        
-        img = Image.open(BytesIO(contents)).convert("RGB")
-        
-        #Convert PIL image to numpy array for OpenCV
-        img_array = np.array(img)
-        img_array = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
+        started = time.perf_counter()
+        size = await read_raw_body(request, buf)
+        if size == 0:
+            raise HTTPException(400, "Empty frame body")
+        timings = []
+        app.state.metrics.lap("read", started, timings)
+        return await process_frame(memoryview(buf)[:size], device_id, started, timings)
+    finally:
+        pool.release(buf)
+
+async def enforce_rate_limit(device_id: str):
+    """Reject the request with 429 if the device is over its frame budget"""
+    limiter = app.state.rate_limiter
+    if not await limiter.check_rate_limit(device_id):
+        app.state.metrics.rate_limited += 1
+        raise HTTPException(
+            status_code=429,
+            detail=f"Rate limit exceeded. Max {limiter.limit_for(device_id)} frames "
+                   f"per {limiter.window:g}s."
+        )
+
+async def process_frame(contents, device_id: str, started: float, timings: list) -> JSONResponse:
+    """
+    Run detection, tracking, alerts and display on one encoded frame
 
-        # Detection and tracking (run in thread pool to avoid blocking)
-        loop = asyncio.get_event_loop()
-        results = await loop.run_in_executor(
-            None,  # Use default ThreadPoolExecutor
-            lambda: model.track(img, persist=True)
+    started is the perf_counter() time the request body began arriving;
+    each stage after it is timed into app.state.metrics and timings.
+    """
+    metrics = app.state.metrics
+    frame_id = app.state.tracer.next_id()
+    device = app.state.devices.touch(device_id)
+    t = time.perf_counter()
+    try:
+        # One BGR array feeds both the model and the display
+        img_array, scale = app.state.frame_decoder.decode(contents)
+        t = metrics.lap("decode", t, timings)
+
+        # Detection and tracking on the inference worker (latest frame wins)
+        result = await app.state.inference.submit(device_id, img_array)
+        t = metrics.lap("inference", t, timings)
+        if result is FRAME_DROPPED:
+            return frame_response({
+                "success": True,
+                "dropped": True,
+                "detections": [],
+                "total_tracked": 0
+            }, "dropped", frame_id, device_id, started, timings)
+
+        detections, alert_rows = postprocess_result(
+            result,
+            app.state.inference.model.names,
+            app.state.alert_class_ids,
+            app.state.distance_estimator,
+            scale
         )
+        t = metrics.lap("postprocess", t, timings)
 
-        detections = []
-        alert_tasks = []  # Collect async alert tasks
+        alerts = await device.memory.update_many(alert_rows)
+        t = metrics.lap("memory", t, timings)
 
-        for result in results:
-            for box in result.boxes:
-                class_name = model.names[int(box.cls[0])]
-                confidence = float(box.conf[0])
-                
-                # Skip low confidence detections
-                if confidence < settings.confidence_threshold:
-                    continue
-                
-                # Get track ID
-                track_id = int(box.id[0]) if box.id is not None else None
-                bbox = box.xyxy[0].tolist()
-                
-                # Estimate distance using proper calibration
-                distance = app.state.distance_estimator.estimate_distance(bbox, class_name)
-                
-                detections.append({
-                    "class": class_name,
-                    "confidence": confidence,
-                    "bbox": bbox,
-                    "track_id": track_id,
-                    "distance": distance
-                })
-
-                # Alert logic (only for tracked objects in alert classes)
-                if (class_name in ALERT_CLASSES 
-                    and track_id is not None):
-                    
-                    alert_type = await app.state.object_memory.update(track_id, distance)
-                    
-                    if alert_type:
-                        # Schedule async alert (non-blocking)
-                        alert_task = asyncio.create_task(
-                            app.state.esp32_client.send_alert(class_name, distance, alert_type)
-                        )
-                        alert_tasks.append(alert_task)
-
-        # Wait for all alerts to complete (with timeout)
-        if alert_tasks:
-            done, pending = await asyncio.wait(alert_tasks, timeout=1.0)
-    
-            # Cancel any tasks that didn't complete
-            if pending:
-                logger.warning(f"Cancelling {len(pending)} slow alert tasks")
-                for task in pending:
-                    task.cancel()
-        
-                # Wait for cancellation to complete
-                await asyncio.gather(*pending, return_exceptions=True)
+        # Alerts go to the dispatcher; the response doesn't wait for the audio unit
+        for class_name, distance, alert_type in alerts:
+            app.state.alert_sinks.submit(class_name, distance, alert_type)
+        metrics.alerts_submitted += len(alerts)
+        t = metrics.lap("alerts", t, timings)
 
         # Display frame with detections
         if app.state.display_enabled:
-            display_frame(img_array, detections)
+            app.state.renderer.submit(img_array, detections, scale)
+        app.state.preview.submit(device_id, img_array, detections, scale)
+        metrics.lap("display", t, timings)
 
-        return JSONResponse({
+        return frame_response({
             "success": True,
             "detections": detections,
-            "total_tracked": len([d for d in detections if d['track_id'] is not None])
-        })
+            "total_tracked": sum(1 for d in detections if d['track_id'] is not None)
+        }, "ok", frame_id, device_id, started, timings, alerts=len(alerts))
 
     except Exception as e:
-        logger.exception(f"Error processing frame: {e}")
-        return JSONResponse({
+        logger.exception(f"Error processing frame #{frame_id}: {e}")
+        return frame_response({
             "success": False,
             "error": str(e)
-        }, status_code=500)
+        }, "error", frame_id, device_id, started, timings, status_code=500)
+
+def frame_response(body: dict, outcome: str, frame_id: int, device_id: str, started: float,
+                   timings: list, alerts: int = 0, status_code: int = 200) -> JSONResponse:
+    """
+    Finish a frame: count it, trace it and tag the response
+
+    The response carries X-Frame-ID (also frame_id in the body) and a
+    Server-Timing header with the stage durations, so camera-side logs
+    can be matched with /traces and /metrics.
+    """
+    body["frame_id"] = frame_id
+    response = JSONResponse(body, status_code=status_code)
+    total = app.state.metrics.frame_done(outcome, started)
+    app.state.tracer.record(frame_id, device_id, outcome, total, timings,
+                            len(body.get("detections", ())), alerts)
+    response.headers["X-Frame-ID"] = str(frame_id)
+    response.headers["Server-Timing"] = server_timing(timings, total)
+    return response
 
 @app.get("/")
 def root():
@@ -773,23 +2873,70 @@ def root():
         "message": "YOLO Detection Server",
         "status": "running",
         "model": settings.yolo_model_path,
-        "esp32_enabled": app.state.esp32_client.enabled
+        "backend": settings.inference_backend,
+        "esp32_enabled": app.state.alert_sinks.enabled
+    }
+
+@app.get("/preview")
+async def preview(device: Optional[str] = None):
+    """
+    Live annotated MJPEG stream (open in a browser or VLC)
+
+    ?device=<id> limits it to one camera; otherwise frames from every
+    camera are interleaved.
+    """
+    return StreamingResponse(
+        app.state.preview.stream(device),
+        media_type=f"multipart/x-mixed-replace; boundary={PreviewStreamer.BOUNDARY}"
+    )
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Stage latency histograms and counters in the Prometheus text format"""
+    return PlainTextResponse(
+        app.state.metrics.render(app.state.alert_sinks),
+        media_type="text/plain; version=0.0.4"
+    )
+
+@app.get("/traces")
+def get_traces(device: Optional[str] = None, min_ms: float = 0.0,
+               slowest: bool = False, limit: int = 100):
+    """
+    Recent per-frame stage timings (the last FRAME_TRACE_SIZE frames)
+
+    Example: the 20 slowest frames from one camera that took over 100ms:
+    GET /traces?device=<id>&min_ms=100&slowest=true&limit=20
+    """
+    return {
+        **app.state.tracer.get_stats(),
+        "traces": app.state.tracer.dump(device, min_ms, slowest, limit)
     }
 
 @app.get("/stats")
 async def get_stats():
     """Get server statistics"""
-    memory_stats = await app.state.object_memory.get_stats()
+    device_stats = await app.state.devices.get_stats()
+    per_device = device_stats["devices"].values()
     return {
-        "memory": memory_stats,
+        "memory": {
+            "tracked_objects": sum(d["tracked_objects"] for d in per_device),
+            "memory_size_bytes": sum(d["memory_size_bytes"] for d in per_device)
+        },
+        "devices": device_stats,
+        "inference": app.state.inference.get_stats(),
+        "display": app.state.renderer.get_stats(),
+        "preview": app.state.preview.get_stats(),
+        "traces": app.state.tracer.get_stats(),
+        "logging": log_queue.get_stats(),
+        "rate_limiter": app.state.rate_limiter.get_stats(),
         "config": {
             "danger_distance": settings.danger_distance_m,
             "alert_cooldown": settings.alert_cooldown,
             "focal_length": settings.camera_focal_length_px
         },
         "esp32": {
-            "enabled": app.state.esp32_client.enabled,
-            "url": settings.esp32_audio_url
+            "enabled": app.state.alert_sinks.enabled,
+            "sinks": app.state.alert_sinks.get_stats()
         }
     }
 
@@ -838,17 +2985,12 @@ async def fall_alert(request: Request):
         logger.critical(f"Event: {data.get('event', 'fall_detected')}")
         logger.critical(f"Time: {time.strftime('%H:%M:%S')}")
         
-        # Trigger audio alert using asasynchron HTTP 
-        if app.state.esp32_client.enabled:
-            success = await app.state.esp32_client.send_alert(
-                "emergency",
-                0.0,
-                "fall_alert"
-            )
-            if success:
-                logger.info(f"   ✅ Emergency alert sent to audio unit")
+        # Highest priority: jumps the queue and clears pending notices
+        if app.state.alert_sinks.enabled:
+            if app.state.alert_sinks.submit("emergency", 0.0, "fall_alert"):
+                logger.info(f"   ✅ Emergency alert queued for alert units")
             else:
-                logger.warning(f"   ⚠️  Failed to send emergency alert")
+                logger.warning(f"   ⚠️  Emergency alert not queued")
         
         logger.critical(" ═══════════════════════════════════════\n")
         
@@ -867,7 +3009,8 @@ if __name__ == "__main__":
     logger.info(f"📹 Model: {settings.yolo_model_path}")
     logger.info(f"🎯 Confidence threshold: {settings.confidence_threshold}")
     logger.info(f"⚠️  Danger distance: {settings.danger_distance_m}m")
-    logger.info(f"🔊 ESP32 URL: {settings.esp32_audio_url}")
+    for sink in app.state.alert_sinks.sinks:
+        logger.info(f"🔊 Alert sink '{sink.name}': {sink.url} ({sink.transport})")
     logger.info(f"📐 Focal length: {settings.camera_focal_length_px}px")
     logger.info(f"🧹 Memory cleanup: every {settings.memory_cleanup_interval}s")
     logger.info(f"💾 Max track age: {settings.memory_max_age}s")
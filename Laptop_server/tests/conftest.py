@@ -0,0 +1,26 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""Shared setup for the server tests (run from Laptop_server/: python -m pytest tests)"""
+
+import os
+import sys
+
+import pytest
+
+# Keep test runs out of the server's log file (see setup_logging)
+os.environ.setdefault("LOG_FILE", "")
+
+# The tests import server.py, which lives one level up
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def stop_server_logging():
+    """Write out server log records while pytest's captured stderr is still open"""
+    yield
+    import server
+    server.log_queue.stop()
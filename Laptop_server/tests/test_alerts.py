@@ -0,0 +1,83 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""AlertDispatcher cooldowns per class and alert type"""
+
+import asyncio
+
+from server import AlertDispatcher
+
+
+class RecordingClient:
+    """Stands in for ESP32AlertClient; records what would be played"""
+
+    def __init__(self):
+        self.played = []
+
+    async def send_alert(self, obj_class, distance, alert_type):
+        self.played.append((obj_class, alert_type))
+        return True
+
+
+async def deliver(dispatcher):
+    """Let the dispatcher task drain its queue"""
+    for _ in range(20):
+        await asyncio.sleep(0.01)
+        if not dispatcher._pending:
+            return
+
+
+def run(*alerts):
+    async def scenario():
+        client = RecordingClient()
+        dispatcher = AlertDispatcher(client, playback_s=0)
+        dispatcher.start()
+        try:
+            results = []
+            for alert in alerts:
+                results.append(dispatcher.submit(*alert))
+                await deliver(dispatcher)
+            return client.played, results
+        finally:
+            await dispatcher.stop()
+
+    return asyncio.run(scenario())
+
+
+def test_approaching_is_not_held_back_by_presence():
+    played, results = run(("person", 4.0, "presence"), ("person", 2.0, "approaching"))
+    assert results == [True, True]
+    assert played == [("person", "presence"), ("person", "approaching")]
+
+
+def test_same_type_waits_out_the_cooldown():
+    played, results = run(("person", 2.0, "approaching"), ("person", 1.5, "approaching"))
+    assert results == [True, False]
+    assert played == [("person", "approaching")]
+
+
+def test_presence_waits_out_any_clip_for_the_class():
+    played, results = run(("car", 2.0, "approaching"), ("car", 2.0, "presence"))
+    assert results == [True, False]
+    assert played == [("car", "approaching")]
+
+
+def test_urgent_alert_skips_the_playback_wait():
+    async def scenario():
+        client = RecordingClient()
+        dispatcher = AlertDispatcher(client, playback_s=5.0)
+        dispatcher.start()
+        try:
+            dispatcher.submit("bench", 1.0, "presence")
+            await deliver(dispatcher)
+            dispatcher.submit("chair", 1.0, "presence")
+            await asyncio.sleep(0.05)
+            dispatcher.submit("emergency", 0.0, "fall_alert")
+            await deliver(dispatcher)
+            return list(client.played)
+        finally:
+            await dispatcher.stop()
+
+    # The fall alert goes out at once (and drops the queued chair notice)
+    assert asyncio.run(scenario()) == [("bench", "presence"), ("emergency", "fall_alert")]
@@ -0,0 +1,81 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""DistanceEstimator: scalar and batch paths agree, edge cases"""
+
+import numpy as np
+import pytest
+
+from server import DistanceEstimator, settings
+
+# A model with a class that has no height ("kite") and without "banana"
+NAMES = {0: "person", 1: "car", 2: "kite", 3: "Bus"}
+
+
+@pytest.fixture
+def estimator():
+    return DistanceEstimator(NAMES)
+
+
+def random_boxes(count: int, seed: int = 0) -> tuple:
+    rng = np.random.default_rng(seed)
+    x1 = rng.uniform(0, 600, count)
+    y1 = rng.uniform(0, 440, count)
+    heights = rng.uniform(-5, 300, count)  # includes negative heights
+    heights[::7] = 0.0
+    boxes = np.stack([x1, y1, x1 + rng.uniform(1, 80, count), y1 + heights], axis=1)
+    return boxes, rng.integers(0, len(NAMES), count)
+
+
+def test_batch_matches_scalar(estimator):
+    boxes, class_ids = random_boxes(500)
+    batch = estimator.estimate_distances(boxes, class_ids)
+    scalar = [
+        estimator.estimate_distance(box, NAMES[class_id])
+        for box, class_id in zip(boxes.tolist(), class_ids.tolist())
+    ]
+    np.testing.assert_allclose(batch, scalar)
+
+
+def test_known_class_uses_pinhole_model(estimator):
+    pixel_height = 200.0
+    expected = settings.object_heights["person"] * settings.camera_focal_length_px / pixel_height
+    distance = estimator.estimate_distance([0, 0, 50, pixel_height], "person")
+    np.testing.assert_allclose(distance, np.clip(expected, 0.3, 50.0))
+    # Class names are matched case-insensitively
+    np.testing.assert_allclose(
+        estimator.estimate_distance([0, 0, 50, 90], "bus"),
+        estimator.estimate_distance([0, 0, 50, 90], "BUS"),
+    )
+
+
+def test_classes_without_height_use_fallback(estimator):
+    box = [10.0, 20.0, 50.0, 120.0]  # 100 px tall
+    fallback = max(0.5, 10.0 / (100.0 / 100))
+
+    # A model class with no height, a height-table class the model lacks
+    # ("banana" gets an ID after the model's) and a name nobody knows
+    kite = 2
+    assert np.isnan(estimator._heights[kite])
+    assert np.isnan(estimator._heights[-1])
+    np.testing.assert_allclose(
+        estimator.estimate_distances(np.array([box, box]), np.array([kite, -1])),
+        [fallback, fallback],
+    )
+    np.testing.assert_allclose(estimator.estimate_distance(box, "not-a-class"), fallback)
+    assert not np.isnan(estimator._heights[estimator._class_ids["banana"]])
+
+
+def test_flat_boxes_are_far(estimator):
+    boxes = np.array([[0, 50, 10, 50], [0, 50, 10, 40]])
+    np.testing.assert_allclose(estimator.estimate_distances(boxes, np.array([1, -1])), [10.0, 10.0])
+
+
+@pytest.mark.parametrize("boxes, class_ids", [
+    (np.zeros((0, 4), dtype=np.float32), np.zeros(0, dtype=np.int64)),
+    ([], []),
+])
+def test_no_boxes(estimator, boxes, class_ids):
+    distances = estimator.estimate_distances(boxes, class_ids)
+    assert distances.shape == (0,)
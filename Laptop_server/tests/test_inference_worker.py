@@ -0,0 +1,49 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""InferenceWorker batching with idle cameras pinned to the worker"""
+
+import asyncio
+import time
+
+from server import InferenceWorker
+
+
+def echo(model, device_ids, imgs):
+    return list(imgs)
+
+
+def test_live_camera_does_not_wait_for_idle_ones():
+    async def scenario():
+        worker = InferenceWorker([object()], echo, batch_window_ms=300, batch_max_frames=8)
+        worker.start()
+        try:
+            # Two cameras pinned to the worker; "idle" then goes quiet
+            await asyncio.gather(worker.submit("live", 1), worker.submit("idle", 2))
+            worker._cadence["idle"][0] -= 60
+
+            start = time.monotonic()
+            assert await worker.submit("live", 3) == 3
+            return time.monotonic() - start
+        finally:
+            worker.stop()
+
+    assert asyncio.run(scenario()) < 0.15
+
+
+def test_streaming_cameras_are_batched():
+    async def scenario():
+        worker = InferenceWorker([object()], echo, batch_window_ms=300, batch_max_frames=8)
+        worker.start()
+        try:
+            await asyncio.gather(worker.submit("a", 1), worker.submit("b", 2))
+            before = worker.batches
+            results = await asyncio.gather(worker.submit("a", 3), worker.submit("b", 4))
+            return results, worker.batches - before
+        finally:
+            worker.stop()
+
+    results, batches = asyncio.run(scenario())
+    assert results == [3, 4]
+    assert batches == 1
@@ -0,0 +1,23 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""FrameBufferPool reuse and size cap"""
+
+from server import MAX_FRAME_BYTES, FrameBufferPool
+
+
+def test_buffers_are_reused():
+    pool = FrameBufferPool(initial_size=1024)
+    buf = pool.acquire(4096)
+    assert len(buf) >= 4096
+    pool.release(buf)
+    assert pool.acquire() is buf
+
+
+def test_oversized_buffers_are_not_pooled():
+    pool = FrameBufferPool(initial_size=1024, max_buffer_size=64 * 1024)
+    for _ in range(pool.max_pooled):
+        pool.release(pool.acquire(MAX_FRAME_BYTES))
+    assert pool._free == []
+    assert len(pool.acquire()) == 1024  # a fresh buffer, not a 10MB one
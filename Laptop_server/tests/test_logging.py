@@ -0,0 +1,60 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""LogQueueHandler: collapsed duplicates are reported without a recurrence"""
+
+import logging
+import time
+
+import server
+from server import LogQueueHandler
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def make_logger(name: str, window: float):
+    handler = LogQueueHandler()
+    handler.duplicates.window = window
+    sink = ListHandler()
+    handler.start(sink)
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.handlers = [handler]
+    return logger, handler, sink
+
+
+def test_counts_flushed_on_timer(monkeypatch):
+    monkeypatch.setattr(server, "LOG_FLUSH_INTERVAL", 0.05)
+    logger, handler, sink = make_logger("test-timer", window=0.1)
+    try:
+        for _ in range(5):
+            logger.warning("ESP32 unreachable")
+        deadline = time.monotonic() + 2
+        while len(sink.messages) < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        handler.stop()
+
+    assert sink.messages[0] == "ESP32 unreachable"
+    assert sink.messages[1].startswith("ESP32 unreachable (+4 identical in ")
+    assert len(sink.messages) == 2
+
+
+def test_counts_flushed_on_stop():
+    logger, handler, sink = make_logger("test-stop", window=60)
+    for _ in range(3):
+        logger.error("decode failed")
+    logger.error("something else")
+    handler.stop()
+
+    assert sink.messages[:2] == ["decode failed", "something else"]
+    assert sink.messages[2].startswith("decode failed (+2 identical in ")
+    assert len(sink.messages) == 3
@@ -0,0 +1,27 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""ObjectMemory eviction accounting"""
+
+import asyncio
+
+from server import ObjectMemory
+
+
+def test_evictions_are_counted_not_logged_one_by_one(caplog):
+    async def scenario():
+        memory = ObjectMemory()
+        memory.MAX_TRACKS = 4
+        await memory.update_many([(i, 5.0, "person") for i in range(10)])
+        stats = await memory.get_stats()
+        await memory.cleanup_stale_tracks()
+        await memory.cleanup_stale_tracks()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats["tracked_objects"] == 4
+    assert stats["evicted_tracks"] == 6
+
+    warnings = [r.getMessage() for r in caplog.records if r.levelname == "WARNING"]
+    assert warnings == ["Memory full, evicted 6 tracks since last cleanup"]
@@ -0,0 +1,81 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""Per-device tracking against the installed ultralytics version"""
+
+import numpy as np
+import torch
+from ultralytics.engine.results import Results
+from ultralytics.trackers.basetrack import BaseTrack
+
+from server import TRACK_CONF, _own_track_ids, apply_tracker, create_tracker, predictor_filter
+
+NAMES = {0: "car", 1: "person"}
+IMG = np.zeros((240, 320, 3), dtype=np.uint8)
+
+
+def frame(rows):
+    boxes = torch.tensor(rows, dtype=torch.float32).reshape(-1, 6)  # x1 y1 x2 y2 conf cls
+    return Results(IMG, path="test.jpg", names=NAMES, boxes=boxes)
+
+
+def test_create_tracker():
+    tracker = create_tracker()
+    assert hasattr(tracker, "update")
+
+
+def test_tracker_keeps_id_across_frames():
+    tracker = create_tracker()
+    ids = []
+    for step in range(4):
+        result = apply_tracker(tracker, frame([[10 + step, 20, 60 + step, 120, 0.9, 0]]))
+        assert result.boxes.is_track
+        ids.append(result.boxes.id.tolist())
+    assert ids == [ids[0]] * 4
+
+
+def test_empty_frame_still_updates_tracker():
+    tracker = create_tracker()
+    apply_tracker(tracker, frame([[10, 20, 60, 120, 0.9, 0]]))
+    frame_id = tracker.frame_id
+    result = apply_tracker(tracker, frame([]))
+    assert len(result.boxes) == 0
+    assert tracker.frame_id == frame_id + 1
+
+
+def test_new_camera_does_not_reissue_live_ids():
+    first = create_tracker()
+    for _ in range(3):
+        apply_tracker(first, frame([[10, 20, 60, 120, 0.9, 0]]))
+
+    # A second camera's tracker; 8.1.0 trackers reset the shared counter here
+    create_tracker()
+    BaseTrack.reset_id()
+
+    ids = set()
+    for _ in range(3):
+        result = apply_tracker(first, frame([[10, 20, 60, 120, 0.9, 0],
+                                             [200, 20, 250, 120, 0.9, 1]]))
+        ids.update(result.boxes.id.int().tolist())
+    assert len(ids) == 2
+
+
+class SharedCounterTracker:
+    """An old-style tracker: no _ids, tracks draw IDs from BaseTrack"""
+
+    def init_track(self, count):
+        return [BaseTrack() for _ in range(count)]
+
+
+def test_old_style_trackers_get_their_own_ids():
+    a = _own_track_ids(SharedCounterTracker())
+    b = _own_track_ids(SharedCounterTracker())
+    assert [t.next_id() for t in a.init_track(2)] == [1, 2]
+    assert [t.next_id() for t in b.init_track(1)] == [1]
+    BaseTrack.reset_id()
+    assert [t.next_id() for t in a.init_track(1)] == [3]
+
+
+def test_predict_keeps_low_score_boxes_for_the_tracker():
+    assert predictor_filter({"car": 2, "person": 0})["conf"] == TRACK_CONF
@@ -0,0 +1,149 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""UDP alert transport against the udp_alert_receiver stand-in"""
+
+import asyncio
+import socket
+
+import pytest
+
+from server import (ACK_PACKET, ALERT_PACKET, ESP32AlertClient, UDPAlertProtocol, decode_ack,
+                    decode_alert, encode_ack, encode_alert, settings)
+from udp_alert_receiver import start_receiver
+
+
+@pytest.mark.parametrize("alert_type", ["presence", "approaching", "fall_alert"])
+@pytest.mark.parametrize("ack", [False, True])
+def test_alert_round_trip(alert_type, ack):
+    packet = encode_alert(41, "traffic light", 2.345, alert_type, ack)
+    assert decode_alert(packet) == {
+        "seq": 41, "object": "traffic light", "distance": 2.35, "type": alert_type, "ack": ack
+    }
+
+
+def test_alert_fields_are_clamped():
+    assert decode_alert(encode_alert(2**32 + 5, "x" * 300, -1.0, "presence"))["seq"] == 5
+    assert len(decode_alert(encode_alert(1, "x" * 300, 1.0, "presence"))["object"]) == 255
+    assert decode_alert(encode_alert(1, "car", -1.0, "presence"))["distance"] == 0.0
+    assert decode_alert(encode_alert(1, "car", 1000.0, "presence"))["distance"] == 655.35
+
+
+@pytest.mark.parametrize("packet", [
+    b"",
+    encode_alert(1, "car", 1.0, "presence")[:ALERT_PACKET.size - 1],  # short header
+    b"XX" + encode_alert(1, "car", 1.0, "presence")[2:],              # wrong magic
+    ALERT_PACKET.pack(b"SA", 2, 0, 0, 1, 100, 3) + b"car",            # unknown version
+    ALERT_PACKET.pack(b"SA", 1, 9, 0, 1, 100, 3) + b"car",            # unknown type code
+    encode_alert(1, "car", 1.0, "presence")[:-1],                     # truncated name
+])
+def test_malformed_alert_packets(packet):
+    with pytest.raises(ValueError):
+        decode_alert(packet)
+
+
+def test_acks():
+    assert decode_ack(encode_ack(7)) == 7
+    assert decode_ack(encode_ack(7) + b"\0") is None
+    assert decode_ack(ACK_PACKET.pack(b"AK", 2, 7)) is None
+    assert decode_ack(encode_alert(7, "car", 1.0, "presence")) is None
+
+
+class Rolls:
+    """Replaces the receiver's RNG: datagrams are dropped while the roll < drop_rate"""
+
+    def __init__(self, *values):
+        self.values = list(values)
+
+    def random(self):
+        return self.values.pop(0) if self.values else 1.0
+
+
+async def connect(drop_rate: float = 0.0, rolls: tuple = ()):
+    transport, receiver = await start_receiver(drop_rate=drop_rate, verbose=False)
+    if rolls:
+        receiver._rng = Rolls(*rolls)
+    _, protocol = await asyncio.get_running_loop().create_datagram_endpoint(
+        UDPAlertProtocol, remote_addr=transport.get_extra_info("sockname")[:2]
+    )
+    return transport, receiver, protocol
+
+
+def close(*transports):
+    for transport in transports:
+        transport.close()
+
+
+def test_fire_and_forget_and_acked_sends():
+    async def scenario():
+        transport, receiver, protocol = await connect()
+        try:
+            assert await protocol.send(encode_alert(1, "car", 2.0, "presence"), 1, False, 0.2, 3)
+            assert await protocol.send(encode_alert(2, "emergency", 0.0, "fall_alert", True),
+                                       2, True, 0.2, 3)
+            await asyncio.sleep(0.05)
+            return receiver.received, protocol.counts
+        finally:
+            close(protocol.transport, transport)
+
+    received, counts = asyncio.run(scenario())
+    assert [(a["seq"], a["type"], a["ack"]) for a in received] == [
+        (1, "presence", False), (2, "fall_alert", True)
+    ]
+    assert counts == {"sent": 2, "acked": 1, "retries": 0, "unacked": 0, "errors": 0}
+
+
+def test_lost_datagram_is_retried_until_acked():
+    async def scenario():
+        transport, receiver, protocol = await connect(drop_rate=0.5, rolls=(0.0, 0.0))
+        try:
+            ok = await protocol.send(encode_alert(3, "emergency", 0.0, "fall_alert", True),
+                                     3, True, 0.05, 3)
+            return ok, receiver.dropped, protocol.counts
+        finally:
+            close(protocol.transport, transport)
+
+    ok, dropped, counts = asyncio.run(scenario())
+    assert ok
+    assert dropped == 2
+    assert counts == {"sent": 3, "acked": 1, "retries": 2, "unacked": 0, "errors": 0}
+
+
+def test_gives_up_when_never_acked():
+    async def scenario():
+        transport, receiver, protocol = await connect(drop_rate=1.0)
+        try:
+            ok = await protocol.send(encode_alert(4, "emergency", 0.0, "fall_alert", True),
+                                     4, True, 0.02, 2)
+            return ok, protocol.counts, protocol._waiters
+        finally:
+            close(protocol.transport, transport)
+
+    ok, counts, waiters = asyncio.run(scenario())
+    assert not ok
+    assert counts == {"sent": 3, "acked": 0, "retries": 2, "unacked": 1, "errors": 0}
+    assert waiters == {}
+
+
+def test_bounced_fire_and_forget_alerts_open_the_breaker(monkeypatch):
+    monkeypatch.setattr(settings, "esp32_breaker_threshold", 2)
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.bind(("127.0.0.1", 0))
+        closed_port = s.getsockname()[1]  # nothing listens once the socket is closed
+
+    async def scenario():
+        client = ESP32AlertClient(url="http://127.0.0.1/alert", transport="udp",
+                                  udp_port=closed_port)
+        await client.start()
+        try:
+            for _ in range(5):
+                await client.send_alert("car", 2.0, "presence")
+                await asyncio.sleep(0.05)
+            return client.breaker.state, client.udp.counts["errors"]
+        finally:
+            await client.stop()
+
+    state, errors = asyncio.run(scenario())
+    assert errors >= 2
+    assert state == "open"
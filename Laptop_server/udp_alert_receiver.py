@@ -0,0 +1,87 @@
+# PerceptaLucis™
+# © 2026 Rajdeep Debnath
+# CC BY-NC-SA 4.0
+
+"""
+Stand-in for the ESP32 audio unit's UDP alert listener
+
+Decodes the alert datagrams ESP32AlertClient sends with ESP32_TRANSPORT=udp,
+prints them and acks the ones that ask for it, the same way
+esp32_audio_alert.ino does. Use it to try the UDP path without hardware.
+--drop simulates packet loss, so the ack/retry path can be exercised.
+
+Usage (from Laptop_server/):
+    python udp_alert_receiver.py --port 5005 --drop 0.2
+    # then run the server with ESP32_TRANSPORT=udp and
+    # ESP32_AUDIO_URL=http://127.0.0.1/alert
+"""
+
+import argparse
+import asyncio
+import random
+
+from server import decode_alert, encode_ack
+
+
+class UDPAlertReceiver(asyncio.DatagramProtocol):
+    """Decode alerts, ack the ones that ask for it, drop a fraction on purpose"""
+
+    def __init__(self, drop_rate: float = 0.0, verbose: bool = True, seed: int = 0):
+        self.drop_rate = drop_rate
+        self.verbose = verbose
+        self.received: list = []
+        self.dropped = 0
+        self._rng = random.Random(seed)
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        if self._rng.random() < self.drop_rate:
+            self.dropped += 1
+            return
+        try:
+            alert = decode_alert(data)
+        except ValueError as e:
+            print(f"bad packet from {addr}: {e}")
+            return
+        self.received.append(alert)
+        if alert["ack"]:
+            self.transport.sendto(encode_ack(alert["seq"]), addr)
+        if self.verbose:
+            print(f"{addr[0]}:{addr[1]} #{alert['seq']} {alert['type']} "
+                  f"{alert['object']} {alert['distance']:.2f}m{' (acked)' if alert['ack'] else ''}")
+
+
+async def start_receiver(host: str = "127.0.0.1", port: int = 0, drop_rate: float = 0.0,
+                         verbose: bool = True):
+    """Returns (transport, receiver); port 0 picks a free port"""
+    return await asyncio.get_running_loop().create_datagram_endpoint(
+        lambda: UDPAlertReceiver(drop_rate, verbose), local_addr=(host, port)
+    )
+
+
+async def main_async(args):
+    transport, _ = await start_receiver(args.host, args.port, args.drop)
+    host, port = transport.get_extra_info("sockname")[:2]
+    print(f"Listening for UDP alerts on {host}:{port} (drop rate {args.drop})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        transport.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in UDP alert receiver")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5005)
+    parser.add_argument("--drop", type=float, default=0.0, help="fraction of datagrams to ignore")
+    try:
+        asyncio.run(main_async(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -241,6 +241,7 @@
 // # CC BY-NC-SA 4.0
 
 #include <WiFi.h>
+#include <WiFiUdp.h>
 #include <WebServer.h>
 #include <SPI.h>
 #include <SD.h>
@@ -259,7 +260,11 @@ const char* bt_name  = "ESP32-YOLO-AUDIO";
 // SD card CS pin
 #define SD_CS 5
 
+// UDP alerts (server ESP32_TRANSPORT=udp, ESP32_UDP_PORT)
+#define ALERT_UDP_PORT 5005
+
 WebServer server(80);
+WiFiUDP alertUdp;
 BluetoothA2DPSource a2dp;
 
 /* Audio pipeline */
@@ -376,6 +381,54 @@ void handleAlert() {
   server.send(200, "application/json", "{\"status\":\"ok\"}");
 }
 
+/* UDP ALERT HANDLER
+   Packet: "SA", version 1, type (0 presence, 1 approaching, 2 fall_alert),
+   flags (bit 0 = ack requested), seq (uint32 BE), distance cm (uint16 BE),
+   name length, name. Ack: "AK", version 1, seq (uint32 BE) */
+uint32_t lastUdpSeq = 0;
+
+void handleUdpAlert() {
+  int size = alertUdp.parsePacket();
+  if (size <= 0) return;
+
+  uint8_t buf[12 + 255];
+  int len = alertUdp.read(buf, sizeof(buf));
+  if (len < 12 || buf[0] != 'S' || buf[1] != 'A' || buf[2] != 1 || buf[3] > 2) return;
+
+  uint8_t flags = buf[4];
+  uint32_t seq = ((uint32_t)buf[5] << 24) | ((uint32_t)buf[6] << 16) | ((uint32_t)buf[7] << 8) | buf[8];
+  float distance = (((uint16_t)buf[9] << 8) | buf[10]) / 100.0;
+  uint8_t nameLen = buf[11];
+  if (12 + nameLen > len) return;
+
+  // Ack first (receipt, not playback) so the server stops retrying
+  if (flags & 0x01) {
+    uint8_t ack[7] = {'A', 'K', 1, buf[5], buf[6], buf[7], buf[8]};
+    alertUdp.beginPacket(alertUdp.remoteIP(), alertUdp.remotePort());
+    alertUdp.write(ack, sizeof(ack));
+    alertUdp.endPacket();
+  }
+  if (seq == lastUdpSeq) return;  // retry of an alert already played
+  lastUdpSeq = seq;
+
+  const char* types[] = {"presence", "approaching", "fall_alert"};
+  String object = "";
+  for (int i = 0; i < nameLen; i++) object += (char)buf[12 + i];
+  String alertType = types[buf[3]];
+
+  Serial.printf("📨 UDP alert #%u: %s | %.2fm | %s\n", seq, object.c_str(), distance, alertType.c_str());
+
+  String audioPath = selectAudioFile(object, distance, alertType);
+  if (!SD.exists(audioPath.c_str())) {
+    audioPath = "/" + object + ".wav";
+    if (!SD.exists(audioPath.c_str())) {
+      Serial.println("❌ No audio file available");
+      return;
+    }
+  }
+  playWav(audioPath.c_str());
+}
+
 /* Health check endpoint */
 void handleRoot() {
   String status = isPlaying ? "playing" : "idle";
@@ -450,13 +503,16 @@ void setup() {
   server.on("/", HTTP_GET, handleRoot);
   server.on("/alert", HTTP_POST, handleAlert);
   server.begin();
+  alertUdp.begin(ALERT_UDP_PORT);
 
   Serial.println("✅ HTTP server started");
+  Serial.printf("📡 UDP alerts on port %d\n", ALERT_UDP_PORT);
   Serial.printf("🎯 Ready! Send POST to http://%s/alert\n", WiFi.localIP().toString().c_str());
 }
 
 void loop() {
   server.handleClient();
+  handleUdpAlert();
   
   // WiFi reconnection logic
   if (WiFi.status() != WL_CONNECTED) {
@@ -125,7 +125,7 @@ const char* ssid     = "YOUR_WIFI_NAME";
 const char* password = "YOUR_WIFI_PASSWORD";
 
 // Laptop YOLO server endpoint
-const char* serverUrl = "http://LAPTOP_IP:8000/frame";
+const char* serverUrl = "http://LAPTOP_IP:8000/frame/raw";
 
 // Performance tuning
 #define FRAME_DELAY_MS 200        // Base delay (5 FPS)
@@ -223,8 +223,13 @@ bool sendFrame(camera_fb_t *fb, int &detectionCount) {
     http.begin(serverUrl);
     http.setTimeout(HTTP_TIMEOUT_MS);
     http.addHeader("Content-Type", "image/jpeg");
+    http.addHeader("X-Device-ID", WiFi.macAddress());
+    // Server's frame sequence ID and stage timings (match with GET /traces)
+    const char *responseHeaders[] = {"X-Frame-ID", "Server-Timing"};
+    http.collectHeaders(responseHeaders, 2);
 
     int responseCode = http.POST(fb->buf, fb->len);
+    String frameId = http.header("X-Frame-ID");
 
     if (responseCode == 200) {
       // Parse response to get detection count
@@ -235,18 +240,20 @@ bool sendFrame(camera_fb_t *fb, int &detectionCount) {
       
       if (!error && doc["success"]) {
         detectionCount = doc["detections"].size();
-        Serial.printf("✅ Frame sent (attempt %d) - %d detections\n", 
-                      attempt, detectionCount);
+        Serial.printf("✅ Frame #%s sent (attempt %d) - %d detections\n", 
+                      frameId.c_str(), attempt, detectionCount);
+        Serial.printf("   Server-Timing: %s\n", http.header("Server-Timing").c_str());
         http.end();
         return true;
       }
       
-      Serial.printf("✅ Frame sent (attempt %d)\n", attempt);
+      Serial.printf("✅ Frame #%s sent (attempt %d)\n", frameId.c_str(), attempt);
       http.end();
       return true;
     }
     else if (responseCode > 0) {
-      Serial.printf("⚠️ Server error: %d (attempt %d)\n", responseCode, attempt);
+      Serial.printf("⚠️ Server error: %d on frame #%s (attempt %d)\n",
+                    responseCode, frameId.c_str(), attempt);
     }
     else {
       Serial.printf("❌ Connection failed: %s (attempt %d)\n", 